@@ -1,89 +1,269 @@
+import numpy as np
 import streamlit as st
 
-def calculate_arithmetic_sequence(first_term, common_difference, num_terms):
+from sequence_cache import (
+    cached_arithmetic_prefix_sum,
+    cached_format_arithmetic_display,
+    cached_format_geometric_display,
+    cached_geometric_prefix_sum,
+    canonical_key,
+    result_cache,
+)
+from sequence_core import (
+    ArithmeticSequence,
+    GeometricSequence,
+    SequenceTextPrefix,
+    arithmetic_formula,
+    geometric_formula,
+    stream_arithmetic_sequence,
+    stream_geometric_sequence,
+)
+# The original compute API, kept importable from app for existing callers
+from sequence_core import (
+    calculate_arithmetic_sequence,
+    calculate_geometric_sequence,
+    format_arithmetic_display,
+    format_geometric_display,
+)
+from sequence_export import EXPORT_FORMATS, available_export_formats
+from sequence_jobs import GenerationJob
+from sequence_queries import ScaledValue
+
+PAGE_SIZES = (100, 1000, 10000)
+
+# Pages ending within this many terms may be read from the session's formatted
+# prefix, which then holds about 2 MB of text
+PREFIX_MAX_TERMS = 100_000
+
+def page_text(sequence_type, first_term, second_param, num_terms, start, stop):
     """
-    Calculate arithmetic sequence given first term, common difference, and number of terms.
+    Return the text of terms start..stop-1 of a sequence.
     
-    Args:
-        first_term (float): The first term of the sequence
-        common_difference (float): The common difference between consecutive terms
-        num_terms (int): The number of terms to generate
+    The session keeps the formatted prefix of the last sequence viewed. When
+    only the number of terms changes, pages are read from it and only terms not
+    formatted yet are computed, so raising n extends the prefix and lowering
+    it costs nothing. The prefix only grows by pages that start inside it or
+    right after it, so the work per page stays bounded by the page size; other
+    pages are formatted directly as a window.
     
     Returns:
-        list: List of terms in the arithmetic sequence
+        str: The terms joined by ", "
     """
-    sequence = []
-    for i in range(num_terms):
-        term = first_term + (i * common_difference)
-        sequence.append(term)
-    return sequence
+    sequence_class = ArithmeticSequence if sequence_type == "Arithmetic Sequence" else GeometricSequence
+    prefix = st.session_state.get("text_prefix")
+    if prefix is None or prefix.params != (sequence_class, first_term, second_param):
+        prefix = SequenceTextPrefix(sequence_class, first_term, second_param)
+    
+    if stop > PREFIX_MAX_TERMS or start > prefix.formatted_terms:
+        if sequence_type == "Arithmetic Sequence":
+            format_display = cached_format_arithmetic_display
+        else:
+            format_display = cached_format_geometric_display
+        return format_display(first_term, second_param, num_terms, start, stop)[0]
+    
+    st.session_state.text_prefix = prefix
+    prefix.resize(stop)
+    return prefix.text(start, stop)
 
-def calculate_geometric_sequence(first_term, common_ratio, num_terms):
+def start_export_job(sequence_type, first_term, second_param, num_terms, fmt):
     """
-    Calculate geometric sequence given first term, common ratio, and number of terms.
-    
-    Args:
-        first_term (float): The first term of the sequence
-        common_ratio (float): The common ratio between consecutive terms
-        num_terms (int): The number of terms to generate
+    Start streaming a sequence into an export file in the background.
     
     Returns:
-        list: List of terms in the geometric sequence
+        GenerationJob: The running job
     """
-    sequence = []
-    for i in range(num_terms):
-        term = first_term * (common_ratio ** i)
-        sequence.append(term)
-    return sequence
+    if sequence_type == "Arithmetic Sequence":
+        chunks = stream_arithmetic_sequence(first_term, second_param, num_terms, dtype=np.float64)
+    else:
+        chunks = stream_geometric_sequence(first_term, second_param, num_terms)
+    key = (sequence_type, first_term, second_param, num_terms, fmt)
+    return GenerationJob(key, chunks, num_terms, fmt).start()
+
+@st.fragment(run_every=0.5)
+def poll_export_job():
+    """Show the progress and streamed preview of the running export job, every 0.5 s."""
+    job = st.session_state.get("export_job")
+    if job is None or job.done:
+        # Rerun the app once so the finished job is shown without this polling fragment
+        st.rerun()
+    num_terms = job.num_terms
+    st.progress(job.progress, text=f"Generating {job.terms_done:,} of {num_terms:,} terms…")
+    if job.preview:
+        st.code(job.preview + (", …" if job.terms_done < num_terms else ""), language=None)
+    if st.button("Cancel Export"):
+        job.cancel()
+
+def render_export_job():
+    """Show the current export job: polled while it runs, then its result."""
+    job = st.session_state.get("export_job")
+    if job is None:
+        return
+    sequence_type, _, _, _, fmt = job.key
+    if job.cancelled:
+        st.info("Export cancelled.")
+    elif not job.done:
+        poll_export_job()
+    elif job.error is not None:
+        st.error(f"Export failed: {job.error}")
+    else:
+        extension, mime = EXPORT_FORMATS[fmt]
+        st.download_button(
+            "Download Sequence",
+            data=job.read_file,
+            file_name=f"{sequence_type.split()[0].lower()}_sequence{extension}",
+            mime=mime,
+            on_click="ignore",
+        )
 
-def format_arithmetic_display(sequence, first_term, common_difference):
+def summarize_results(sequence_type, first_term, second_param, num_terms):
     """
-    Format the arithmetic sequence for display with additional information.
+    Build the text shown around the paged terms of a calculated sequence.
+    
+    The summary only depends on the parameters, so it is cached and reused by
+    every rerun that pages through or exports the same sequence.
     
     Args:
-        sequence (list): The arithmetic sequence
+        sequence_type (str): "Arithmetic Sequence" or "Geometric Sequence"
         first_term (float): The first term
-        common_difference (float): The common difference
+        second_param (float): The common difference or common ratio
+        num_terms (int): The number of terms
     
     Returns:
-        tuple: (sequence_str, formula)
+        dict: The formula (LaTeX), parameter name, last term, sum and step lines
     """
-    # Create the sequence string
-    sequence_str = ", ".join([str(term) for term in sequence])
-    
-    # Add formula information
-    formula = f"aₙ = {first_term}"
-    if common_difference > 0:
-        formula += f" + {common_difference}(n-1)"
-    elif common_difference < 0:
-        formula += f" - {abs(common_difference)}(n-1)"
+    if sequence_type == "Arithmetic Sequence":
+        sequence = ArithmeticSequence(first_term, second_param, num_terms)
+        formula = arithmetic_formula(first_term, second_param)
+        param_name = "Common Difference"
+        # Sum of arithmetic sequence: n/2 * (first_term + last_term)
+        sequence_sum = cached_arithmetic_prefix_sum(first_term, second_param, num_terms)
     else:
-        formula += " + 0(n-1)"
+        sequence = GeometricSequence(first_term, second_param, num_terms)
+        formula = geometric_formula(first_term, second_param)
+        param_name = "Common Ratio"
+        # Sum of geometric sequence: a(r^n - 1)/(r - 1) for r ≠ 1
+        sequence_sum = cached_geometric_prefix_sum(first_term, second_param, num_terms)
+    
+    last_term = sequence[-1]
+    
+    # Step-by-step calculation for the first few terms
+    steps = []
+    if num_terms >= 3:
+        for i in range(3):
+            term_value = sequence[i]
+            if i == 0:
+                calculation = f"a₁ = {first_term}"
+            elif sequence_type == "Arithmetic Sequence":
+                calculation = f"a{i+1} = {first_term} + {second_param} × {i} = {term_value}"
+            else:
+                calculation = f"a{i+1} = {first_term} × {second_param}^{i} = {term_value}"
+            steps.append(f"**Term {i+1}:** {calculation}")
     
-    return sequence_str, formula
+    return {
+        "latex": formula.replace("aₙ", "a_n").replace("₁", "_1"),
+        "param_name": param_name,
+        "last_term": str(last_term) if isinstance(last_term, ScaledValue) else last_term,
+        "sum": f"{sequence_sum:.2f}",
+        "steps": steps,
+    }
 
-def format_geometric_display(sequence, first_term, common_ratio):
+def render_results(sequence_type, first_term, second_param, num_terms):
     """
-    Format the geometric sequence for display with additional information.
+    Display the results section for a calculated sequence.
     
     Args:
-        sequence (list): The geometric sequence
+        sequence_type (str): "Arithmetic Sequence" or "Geometric Sequence"
         first_term (float): The first term
-        common_ratio (float): The common ratio
+        second_param (float): The common difference or common ratio
+        num_terms (int): The number of terms
+    """
+    summary = result_cache.get_or_compute(
+        canonical_key("summary", sequence_type, first_term, second_param, num_terms),
+        lambda: summarize_results(sequence_type, first_term, second_param, num_terms),
+    )
+    # Display results
+    st.header("Results")
     
-    Returns:
-        tuple: (sequence_str, formula)
+    # Show the formula
+    st.subheader("General Formula")
+    st.latex(summary["latex"])
+    
+    # Show sequence information
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("First Term", first_term)
+    
+    with col2:
+        st.metric(summary["param_name"], second_param)
+    
+    with col3:
+        st.metric("Number of Terms", num_terms)
+    
+    # Display the sequence
+    st.subheader(f"{sequence_type}")
+    
+    # Show one page of terms; only terms not yet in the session's prefix are formatted
+    page_size = st.selectbox("Terms per page", PAGE_SIZES, index=1, key="page_size")
+    num_pages = -(-num_terms // page_size)
+    if st.session_state.get("page", 1) > num_pages:
+        st.session_state.page = num_pages
+    page = st.number_input("Page", min_value=1, max_value=num_pages, step=1, key="page")
+    start = (page - 1) * page_size
+    stop = min(start + page_size, num_terms)
+    sequence_str = page_text(sequence_type, first_term, second_param, num_terms, start, stop)
+    st.caption(f"Terms {start + 1:,}–{stop:,} of {num_terms:,} (page {page:,} of {num_pages:,})")
+    st.code(sequence_str, language=None)
+    
+    # Generate the full sequence for download in the background
+    st.subheader("Export")
+    export_format = st.selectbox("Export format", available_export_formats(), key="export_format")
+    job_key = (sequence_type, first_term, second_param, num_terms, export_format)
+    job = st.session_state.get("export_job")
+    if job is not None and job.key != job_key:
+        # The inputs changed, so the running export is superseded
+        job.cancel()
+        del st.session_state.export_job
+    if st.button("Prepare Download"):
+        if job is not None:
+            job.cancel()
+        st.session_state.export_job = start_export_job(*job_key)
+    render_export_job()
+    
+    # Show additional information
+    st.subheader("Additional Information")
+    
+    info_col1, info_col2 = st.columns(2)
+    
+    with info_col1:
+        st.metric("Last Term", summary["last_term"])
+        
+    with info_col2:
+        # The sum is calculated in closed form, without touching the terms
+        st.metric("Sum of Sequence", summary["sum"])
+    
+    # Show step-by-step calculation for first few terms
+    if summary["steps"]:
+        st.subheader("Step-by-Step Calculation (First 3 Terms)")
+        
+        for step in summary["steps"]:
+            st.write(step)
+
+@st.fragment
+def results_fragment(sequence_params):
     """
-    # Create the sequence string
-    sequence_str = ", ".join([str(term) for term in sequence])
+    Render the results as a fragment.
     
-    # Add formula information
-    if common_ratio == 1:
-        formula = f"aₙ = {first_term}"
-    else:
-        formula = f"aₙ = {first_term} × {common_ratio}^(n-1)"
+    Paging and export controls rerun only this section, not the input panel or
+    the rest of the page.
     
-    return sequence_str, formula
+    Args:
+        sequence_params (tuple): The arguments for render_results
+    """
+    try:
+        render_results(*sequence_params)
+    except Exception as e:
+        st.error(f"An error occurred during calculation: {str(e)}")
 
 def main():
     # Set page configuration
@@ -105,139 +285,68 @@ def main():
         help="Arithmetic: constant difference between terms. Geometric: constant ratio between terms."
     )
     
-    # Create input section
-    st.header("Input Parameters")
-    
-    # Create columns for better layout
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        first_term = st.number_input(
-            "First Term (a₁)",
-            value=1.0,
-            step=1.0,
-            help="The first term of the sequence"
-        )
+    # Create input section; the inputs are sent together when the form is submitted,
+    # so editing them does not rerun the script
+    with st.form("input_parameters"):
+        st.header("Input Parameters")
         
-        if sequence_type == "Arithmetic Sequence":
-            second_param = st.number_input(
-                "Common Difference (d)",
+        # Create columns for better layout
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            first_term = st.number_input(
+                "First Term (a₁)",
                 value=1.0,
                 step=1.0,
-                help="The constant difference between consecutive terms"
+                help="The first term of the sequence"
             )
-        else:
-            second_param = st.number_input(
-                "Common Ratio (r)",
-                value=2.0,
-                step=0.1,
-                help="The constant ratio between consecutive terms"
+            
+            if sequence_type == "Arithmetic Sequence":
+                second_param = st.number_input(
+                    "Common Difference (d)",
+                    value=1.0,
+                    step=1.0,
+                    help="The constant difference between consecutive terms"
+                )
+            else:
+                second_param = st.number_input(
+                    "Common Ratio (r)",
+                    value=2.0,
+                    step=0.1,
+                    help="The constant ratio between consecutive terms"
+                )
+        
+        with col2:
+            num_terms = st.number_input(
+                "Number of Terms (n)",
+                min_value=1,
+                value=10,
+                step=1,
+                help="How many terms the sequence has; they are shown one page at a time"
             )
-    
-    with col2:
-        num_terms = st.number_input(
-            "Number of Terms (n)",
-            min_value=1,
-            max_value=1000,
-            value=10,
-            step=1,
-            help="How many terms to display in the sequence"
-        )
+        
+        submitted = st.form_submit_button("Calculate Sequence", type="primary")
     
     # Add some spacing
     st.markdown("---")
     
     # Input validation and calculation
-    if st.button("Calculate Sequence", type="primary"):
-        try:
-            # Validate inputs
-            if num_terms <= 0:
-                st.error("Number of terms must be a positive integer.")
-                return
-            
-            if num_terms > 1000:
-                st.error("Number of terms cannot exceed 1000 for performance reasons.")
-                return
-            
-            if sequence_type == "Geometric Sequence" and second_param == 0:
-                st.error("Common ratio cannot be zero for geometric sequences.")
-                return
-            
-            # Calculate the sequence
-            if sequence_type == "Arithmetic Sequence":
-                sequence = calculate_arithmetic_sequence(first_term, second_param, num_terms)
-                sequence_str, formula = format_arithmetic_display(sequence, first_term, second_param)
-                param_name = "Common Difference"
-            else:
-                sequence = calculate_geometric_sequence(first_term, second_param, num_terms)
-                sequence_str, formula = format_geometric_display(sequence, first_term, second_param)
-                param_name = "Common Ratio"
-            
-            # Display results
-            st.header("Results")
-            
-            # Show the formula
-            st.subheader("General Formula")
-            st.latex(formula.replace("aₙ", "a_n").replace("₁", "_1"))
-            
-            # Show sequence information
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("First Term", first_term)
-            
-            with col2:
-                st.metric(param_name, second_param)
-            
-            with col3:
-                st.metric("Number of Terms", num_terms)
-            
-            # Display the sequence
-            st.subheader(f"{sequence_type}")
-            
-            # Show sequence in a nice format
-            st.code(sequence_str, language=None)
-            
-            # Show additional information
-            st.subheader("Additional Information")
-            
-            info_col1, info_col2 = st.columns(2)
-            
-            with info_col1:
-                st.metric("Last Term", sequence[-1])
-                
-            with info_col2:
-                # Calculate sum
-                if sequence_type == "Arithmetic Sequence":
-                    # Sum of arithmetic sequence: n/2 * (first_term + last_term)
-                    sequence_sum = (num_terms / 2) * (first_term + sequence[-1])
-                else:
-                    # Sum of geometric sequence: a(r^n - 1)/(r - 1) for r ≠ 1
-                    if second_param == 1:
-                        sequence_sum = first_term * num_terms
-                    else:
-                        sequence_sum = first_term * (second_param**num_terms - 1) / (second_param - 1)
-                
-                st.metric("Sum of Sequence", f"{sequence_sum:.2f}")
-            
-            # Show step-by-step calculation for first few terms
-            if num_terms >= 3:
-                st.subheader("Step-by-Step Calculation (First 3 Terms)")
-                
-                for i in range(min(3, num_terms)):
-                    term_value = sequence[i]
-                    if i == 0:
-                        calculation = f"a₁ = {first_term}"
-                    else:
-                        if sequence_type == "Arithmetic Sequence":
-                            calculation = f"a{i+1} = {first_term} + {second_param} × {i} = {term_value}"
-                        else:
-                            calculation = f"a{i+1} = {first_term} × {second_param}^{i} = {term_value}"
-                    
-                    st.write(f"**Term {i+1}:** {calculation}")
+    if submitted:
+        # Validate inputs
+        if num_terms <= 0:
+            st.error("Number of terms must be a positive integer.")
+            return
         
-        except Exception as e:
-            st.error(f"An error occurred during calculation: {str(e)}")
+        if sequence_type == "Geometric Sequence" and second_param == 0:
+            st.error("Common ratio cannot be zero for geometric sequences.")
+            return
+        
+        # Remember the calculation so paging through results keeps it on screen
+        st.session_state.sequence_params = (sequence_type, first_term, second_param, num_terms)
+        st.session_state.page = 1
+    
+    if "sequence_params" in st.session_state:
+        results_fragment(st.session_state.sequence_params)
     
     # Add information section
     st.markdown("---")
@@ -0,0 +1,214 @@
+"""
+Throughput benchmarks for the sequence engines.
+
+Run with `python benchmark.py` for everything, or name the benchmarks to run,
+e.g. `python benchmark.py import_time formatting`. The import_time benchmark
+exits with status 1 on a regression, so it can guard CI.
+"""
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from sequence_core import (
+    arithmetic_sequence_array,
+    batch_arithmetic_sequences,
+    batch_geometric_sequences,
+    calculate_arithmetic_sequence,
+    exact_geometric_sequence,
+    geometric_sequence_array,
+)
+from sequence_format import FloatFormatter
+from sequence_parallel import sharded_arithmetic_sequence, sharded_geometric_sequence
+from sequence_queries import geometric_prefix_sum
+
+def loop_arithmetic_sequence(first_term, common_difference, num_terms):
+    """Reference implementation: the original one-term-at-a-time loop."""
+    sequence = []
+    for i in range(num_terms):
+        sequence.append(first_term + (i * common_difference))
+    return sequence
+
+def loop_geometric_sequence(first_term, common_ratio, num_terms):
+    """Reference implementation: the original per-term exponentiation loop."""
+    sequence = []
+    for i in range(num_terms):
+        sequence.append(first_term * (common_ratio ** i))
+    return sequence
+
+def best_time(func, *args, repeat=3):
+    """Return the best wall-clock time in seconds over `repeat` runs of func(*args)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def report(label, num_terms, seconds):
+    print(f"{label:<32} n={num_terms:<12,} {seconds * 1e3:>10.2f} ms  {num_terms / seconds / 1e6:>10.1f} Mterms/s")
+
+def bench_arithmetic(sizes=(10**3, 10**6, 10**8), loop_limit=10**6):
+    print("Arithmetic sequence")
+    for num_terms in sizes:
+        # The list baseline at 10^8 terms needs several GB of boxed floats, so skip it
+        if num_terms <= loop_limit:
+            report("python loop", num_terms, best_time(loop_arithmetic_sequence, 1.0, 0.5, num_terms))
+        for dtype in (np.float64, np.float32):
+            seconds = best_time(arithmetic_sequence_array, 1.0, 0.5, num_terms, dtype)
+            report(f"numpy {np.dtype(dtype).name}", num_terms, seconds)
+
+def bench_geometric(sizes=(10**3, 10**6), int_sizes=(10**3, 10**4)):
+    print("Geometric sequence")
+    for num_terms in sizes:
+        report("python loop (float)", num_terms, best_time(loop_geometric_sequence, 1.0, 1.0000001, num_terms))
+        report("incremental numpy (float)", num_terms, best_time(geometric_sequence_array, 1.0, 1.0000001, num_terms))
+    for num_terms in int_sizes:
+        report("python loop (int)", num_terms, best_time(loop_geometric_sequence, 1, 3, num_terms))
+        report("incremental exact (int)", num_terms, best_time(exact_geometric_sequence, 1, 3, num_terms))
+
+def bench_sharded(num_terms=10**8, worker_counts=(1, 2, 4, 8)):
+    print("Sharded generation")
+    report("single-core arithmetic", num_terms, best_time(arithmetic_sequence_array, 1.0, 0.5, num_terms))
+    for workers in worker_counts:
+        seconds = best_time(sharded_arithmetic_sequence, 1.0, 0.5, num_terms, workers)
+        report(f"sharded arithmetic x{workers}", num_terms, seconds)
+    report("single-core geometric", num_terms, best_time(geometric_sequence_array, 1.0, 1.0000001, num_terms))
+    for workers in worker_counts:
+        seconds = best_time(sharded_geometric_sequence, 1.0, 1.0000001, num_terms, workers)
+        report(f"sharded geometric x{workers}", num_terms, seconds)
+    # Writing into a .npy file skips the copy out of shared memory
+    with tempfile.TemporaryDirectory() as directory:
+        out_path = os.path.join(directory, "sequence.npy")
+        for workers in worker_counts:
+            seconds = best_time(sharded_geometric_sequence, 1.0, 1.0000001, num_terms, workers, np.float64, out_path)
+            report(f"sharded geometric x{workers} to .npy", num_terms, seconds)
+
+def bench_batch(num_sets=10**4, num_terms=100):
+    print("Batch parameter sweep")
+    rng = np.random.default_rng(0)
+    first_terms = rng.uniform(-10, 10, num_sets)
+    steps = rng.uniform(0.5, 1.5, num_sets)
+    lengths = rng.integers(1, num_terms + 1, num_sets)
+    total = num_sets * num_terms
+
+    def one_call_per_set():
+        for a, d in zip(first_terms.tolist(), steps.tolist()):
+            calculate_arithmetic_sequence(a, d, num_terms)
+
+    report("per-set calls", total, best_time(one_call_per_set))
+    report("batch arithmetic (uniform)", total, best_time(batch_arithmetic_sequences, first_terms, steps, num_terms))
+    report("batch arithmetic (mixed, ragged)", int(lengths.sum()),
+           best_time(lambda: batch_arithmetic_sequences(first_terms, steps, lengths, ragged=True)))
+    report("batch geometric (uniform)", total, best_time(batch_geometric_sequences, first_terms, steps, num_terms))
+
+def bench_geometric_sum(ratios=(1.0000001, 1.00001), sizes=(10**3, 10**6)):
+    print("Geometric sum near r = 1 (relative error against math.fsum of the terms)")
+
+    def loop_sum(ratio, num_terms):
+        total, term = 0.0, 1.0
+        for _ in range(num_terms):
+            total += term
+            term *= ratio
+        return total
+
+    def direct_formula(ratio, num_terms):
+        return (ratio ** num_terms - 1) / (ratio - 1)
+
+    for ratio in ratios:
+        for num_terms in sizes:
+            reference = math.fsum(ratio ** k for k in range(num_terms))
+            for label, func in (("loop sum", loop_sum), ("direct formula", direct_formula),
+                                ("geometric_prefix_sum", lambda r, n: geometric_prefix_sum(1.0, r, n))):
+                error = abs(func(ratio, num_terms) - reference) / reference
+                seconds = best_time(func, ratio, num_terms)
+                print(f"{label:<22} r={ratio:<10} n={num_terms:<10,} {seconds * 1e6:>12.2f} us  rel. error {error:.1e}")
+
+    # Sums that overflow float64 go through the log domain, which must handle r near 1 too
+    regressions = []
+    for ratio in (*ratios, 1.1, 1.5):
+        num_terms = 100
+        reference_log10 = 307 + math.log10(math.fsum(ratio ** k for k in range(num_terms)))
+        try:
+            total = geometric_prefix_sum(1e307, ratio, num_terms)
+            error = abs(10 ** (total.log10 - reference_log10) - 1)
+        except Exception as e:
+            regressions.append(f"geometric_prefix_sum(1e307, {ratio}, {num_terms}) raised {e!r}")
+            continue
+        print(f"{'overflowing sum':<22} r={ratio:<10} n={num_terms:<10,} rel. error {error:.1e}")
+        if error > 1e-9:
+            regressions.append(f"geometric_prefix_sum(1e307, {ratio}, {num_terms}) is off by {error:.1e}")
+    return regressions
+
+def bench_formatting(num_terms=10**6):
+    print("Float-to-text formatting")
+    values = np.random.default_rng(0).standard_normal(num_terms) * 1e3
+
+    def per_term_str():
+        return ", ".join([str(term) for term in values.tolist()])
+
+    report("str() per term", num_terms, best_time(per_term_str))
+    for label, formatter in (("FloatFormatter full precision", FloatFormatter()),
+                             ("FloatFormatter 6 significant", FloatFormatter(6)),
+                             ("FloatFormatter fixed 2", FloatFormatter(2, "fixed"))):
+        report(label, num_terms, best_time(formatter.format, values))
+
+# Budget for importing the compute core in a fresh interpreter; NumPy alone
+# accounts for most of it
+CORE_IMPORT_BUDGET_MS = 250
+
+def measure_import(module, repeat=5):
+    """Return the best time in ms to import module in a fresh interpreter, and whether it loaded Streamlit."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print((time.perf_counter() - start) * 1e3, 'streamlit' in sys.modules)\n"
+    )
+    best, loads_streamlit = float("inf"), False
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout
+        milliseconds, streamlit_loaded = output.split()
+        best = min(best, float(milliseconds))
+        loads_streamlit = streamlit_loaded == "True"
+    return best, loads_streamlit
+
+def bench_import_time():
+    print("Import time (fresh interpreter)")
+    regressions = []
+    for module in ("sequence_core", "sequence_cache", "app"):
+        milliseconds, loads_streamlit = measure_import(module)
+        print(f"{module:<32} {milliseconds:>10.1f} ms  streamlit loaded: {loads_streamlit}")
+        if module != "app" and loads_streamlit:
+            regressions.append(f"{module} imports streamlit")
+        if module == "sequence_core" and milliseconds > CORE_IMPORT_BUDGET_MS:
+            regressions.append(f"{module} took {milliseconds:.0f} ms, budget is {CORE_IMPORT_BUDGET_MS} ms")
+    return regressions
+
+BENCHMARKS = {
+    "import_time": bench_import_time,
+    "arithmetic": bench_arithmetic,
+    "geometric": bench_geometric,
+    "sharded": bench_sharded,
+    "batch": bench_batch,
+    "geometric_sum": bench_geometric_sum,
+    "formatting": bench_formatting,
+}
+
+def main(names=None):
+    regressions = []
+    for name in names or BENCHMARKS:
+        regressions += BENCHMARKS[name]() or []
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
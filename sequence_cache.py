@@ -0,0 +1,339 @@
+"""
+In-process result cache shared by every session of the Streamlit server.
+
+Streamlit runs each session's script in its own thread of one process, so a
+module-level ResultCache is visible to all of them. Entries are evicted least
+recently used first, once they expire, or when the cache goes over its memory
+budget. Concurrent misses on the same key are coalesced by a SingleFlight, so a
+burst of identical requests computes the result once. The cached_* functions at
+the bottom wrap the compute core with the shared cache and, if
+SEQUENCE_STORE_PATH is set, the on-disk SequenceStore.
+"""
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from numbers import Real
+
+import numpy as np
+
+from sequence_core import (
+    ArithmeticSequence,
+    GeometricSequence,
+    calculate_arithmetic_sequence,
+    calculate_geometric_sequence,
+    format_arithmetic_display,
+    format_geometric_display,
+    geometric_overflows,
+)
+from sequence_queries import arithmetic_prefix_sum, geometric_prefix_sum
+from sequence_store import SequenceStore
+
+def canonical_key(*parts):
+    """
+    Build a cache key in which numerically equal parameters compare equal.
+    
+    Real numbers are converted to float, so 1, 1.0 and numpy.float64(1) all give
+    the same key. Integers that float64 cannot hold exactly, or at all, are kept
+    as ints.
+    
+    Args:
+        *parts: Hashable key components, typically a kind name and the parameters
+    
+    Returns:
+        tuple: The canonical key
+    """
+    key = []
+    for part in parts:
+        if isinstance(part, Real) and not isinstance(part, bool):
+            try:
+                as_float = float(part)
+            except OverflowError:
+                as_float = None
+            part = as_float if as_float is not None and as_float == part else part
+        key.append(part)
+    return tuple(key)
+
+def estimate_size(value):
+    """Return a rough size in bytes of a cached value, following lists and tuples one level."""
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) if isinstance(item, (str, bytes)) else sys.getsizeof(item) for item in value)
+    return size
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical computations across threads.
+    
+    The first thread to ask for a key runs the computation; every other thread
+    asking for the same key while it runs waits and receives the same result (or
+    exception) instead of repeating the work.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> [done event, result, exception]
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+    
+    def do(self, key, compute):
+        """Return compute(), shared with any concurrent call for the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = [threading.Event(), None, None]
+                self.executions += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            call[0].wait()
+            if call[2] is not None:
+                raise call[2]
+            return call[1]
+        try:
+            call[1] = compute()
+        except BaseException as e:
+            call[2] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call[0].set()
+        return call[1]
+    
+    def stats(self):
+        """Return the number of computations run and of requests that shared one."""
+        with self._lock:
+            return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+# Marks a cache miss, distinct from any value a caller might store
+_MISSING = object()
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with optional time-to-live and memory budget.
+    
+    Args:
+        max_entries (int): Maximum number of entries kept
+        ttl (float, optional): Seconds an entry stays valid. None never expires.
+        max_bytes (int, optional): Memory budget for all entries, as measured by sizeof.
+            Values larger than the whole budget are returned but not stored.
+        sizeof (callable): Function estimating the size in bytes of a value
+        single_flight (SingleFlight, optional): Coalesces concurrent misses on the
+            same key in get_or_compute, so each is computed only once
+    """
+    
+    def __init__(self, max_entries=256, ttl=None, max_bytes=None, sizeof=estimate_size, single_flight=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.single_flight = single_flight
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _discard(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+    
+    def _lookup(self, key):
+        """Return the live value for key, or _MISSING; the caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() >= entry[1]:
+            self._discard(key)
+            entry = None
+        if entry is None:
+            return _MISSING
+        self._entries.move_to_end(key)
+        return entry[0]
+    
+    def get(self, key, default=None):
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        """Store value under key, evicting old entries to respect the limits."""
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (value, expires, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, calling compute() and storing its result on a miss."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.single_flight is None:
+            value = compute()
+            self.put(key, value)
+            return value
+        
+        def compute_and_store():
+            # A previous leader may have stored the value after this thread missed
+            with self._lock:
+                value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+            value = compute()
+            self.put(key, value)
+            return value
+        
+        return self.single_flight.do(key, compute_and_store)
+    
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+    
+    def stats(self):
+        """Return a dict of hit, miss and eviction counters plus current usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+# Shared by every Streamlit session in this server process, and by any other
+# caller of the cached_* functions below
+result_cache = ResultCache(max_entries=512, ttl=3600, max_bytes=256 * 1024 * 1024, single_flight=SingleFlight())
+# Optional on-disk store behind the cache, so results survive server restarts
+result_store = SequenceStore(os.environ["SEQUENCE_STORE_PATH"]) if os.environ.get("SEQUENCE_STORE_PATH") else None
+
+def _through_store(kind, first_term, step, num_terms, compute):
+    """Return compute() via result_store when one is configured and the terms fit in float64."""
+    storable = result_store is not None and not (kind == "geometric" and geometric_overflows(first_term, step, num_terms))
+    if not storable:
+        return compute()
+    stored = result_store.get_sequence(kind, first_term, step, num_terms)
+    if stored is not None:
+        return tuple(stored.tolist())
+    sequence = compute()
+    result_store.put_sequence(kind, first_term, step, np.asarray(sequence, dtype=np.float64))
+    return sequence
+
+def _aggregate_through_store(kind, first_term, step, num_terms, name, compute):
+    """Return compute() via result_store's aggregates when one is configured; finite floats are stored."""
+    if result_store is None:
+        return compute()
+    stored = result_store.get_aggregate(kind, first_term, step, num_terms, name)
+    if stored is not None:
+        return stored
+    value = compute()
+    if isinstance(value, float) and math.isfinite(value):
+        result_store.put_aggregate(kind, first_term, step, num_terms, name, value)
+    return value
+
+def cached_arithmetic_prefix_sum(first_term, common_difference, num_terms):
+    """
+    Cached arithmetic_prefix_sum. Parameters are canonicalized to floats, and the
+    sum is also kept in result_store when one is configured.
+    """
+    first_term, common_difference, num_terms = float(first_term), float(common_difference), int(num_terms)
+    return result_cache.get_or_compute(
+        canonical_key("arithmetic_sum", first_term, common_difference, num_terms),
+        lambda: _aggregate_through_store(
+            "arithmetic", first_term, common_difference, num_terms, "sum",
+            lambda: arithmetic_prefix_sum(first_term, common_difference, num_terms),
+        ),
+    )
+
+def cached_geometric_prefix_sum(first_term, common_ratio, num_terms):
+    """
+    Cached geometric_prefix_sum. Parameters are canonicalized to floats, and the
+    sum is also kept in result_store when one is configured and it fits in a float.
+    """
+    first_term, common_ratio, num_terms = float(first_term), float(common_ratio), int(num_terms)
+    return result_cache.get_or_compute(
+        canonical_key("geometric_sum", first_term, common_ratio, num_terms),
+        lambda: _aggregate_through_store(
+            "geometric", first_term, common_ratio, num_terms, "sum",
+            lambda: geometric_prefix_sum(first_term, common_ratio, num_terms),
+        ),
+    )
+
+def cached_calculate_arithmetic_sequence(first_term, common_difference, num_terms):
+    """
+    Cached calculate_arithmetic_sequence. Parameters are canonicalized to floats,
+    so (1, 1, 10) and (1.0, 1.0, 10) share one entry and both return floats.
+    The terms come back as a tuple, since every caller shares the cached value.
+    """
+    first_term, common_difference, num_terms = float(first_term), float(common_difference), int(num_terms)
+    return result_cache.get_or_compute(
+        canonical_key("arithmetic_sequence", first_term, common_difference, num_terms),
+        lambda: _through_store(
+            "arithmetic", first_term, common_difference, num_terms,
+            lambda: tuple(calculate_arithmetic_sequence(first_term, common_difference, num_terms)),
+        ),
+    )
+
+def cached_calculate_geometric_sequence(first_term, common_ratio, num_terms):
+    """
+    Cached calculate_geometric_sequence. Parameters are canonicalized to floats,
+    so (1, 2, 10) and (1.0, 2.0, 10) share one entry and both return floats.
+    The terms come back as a tuple, since every caller shares the cached value.
+    """
+    first_term, common_ratio, num_terms = float(first_term), float(common_ratio), int(num_terms)
+    return result_cache.get_or_compute(
+        canonical_key("geometric_sequence", first_term, common_ratio, num_terms),
+        lambda: _through_store(
+            "geometric", first_term, common_ratio, num_terms,
+            lambda: tuple(calculate_geometric_sequence(first_term, common_ratio, num_terms)),
+        ),
+    )
+
+def cached_format_arithmetic_display(first_term, common_difference, num_terms, start=0, stop=None):
+    """
+    Cached format_arithmetic_display of terms start..stop-1 of the sequence with
+    the given parameters. Only that window of terms is computed and formatted.
+    """
+    first_term, common_difference, num_terms = float(first_term), float(common_difference), int(num_terms)
+    return result_cache.get_or_compute(
+        canonical_key("arithmetic_display", first_term, common_difference, num_terms, start, stop),
+        lambda: format_arithmetic_display(
+            ArithmeticSequence(first_term, common_difference, num_terms)[start:stop], first_term, common_difference
+        ),
+    )
+
+def cached_format_geometric_display(first_term, common_ratio, num_terms, start=0, stop=None):
+    """
+    Cached format_geometric_display of terms start..stop-1 of the sequence with
+    the given parameters. Only that window of terms is computed and formatted.
+    """
+    first_term, common_ratio, num_terms = float(first_term), float(common_ratio), int(num_terms)
+    return result_cache.get_or_compute(
+        canonical_key("geometric_display", first_term, common_ratio, num_terms, start, stop),
+        lambda: format_geometric_display(
+            GeometricSequence(first_term, common_ratio, num_terms)[start:stop], first_term, common_ratio
+        ),
+    )
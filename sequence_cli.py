@@ -0,0 +1,185 @@
+"""
+Command-line batch tool for the sequence engines.
+
+Reads parameter rows from a file or stdin and streams the resulting sequences
+to stdout. Input rows have the fields kind ("arithmetic" or "geometric"),
+first_term, step (the common difference or ratio) and num_terms, given either as
+CSV with a header row or as NDJSON objects. Rows are processed in batches, and
+each batch is computed with the vectorized batch engines. With --workers, the
+batches are spread over a process pool; output order always matches input order.
+
+Examples:
+    python sequence_cli.py params.csv
+    cat params.ndjson | python sequence_cli.py --input-format ndjson --output-format binary --workers 4 -
+"""
+import argparse
+import collections
+import csv
+import io
+import itertools
+import json
+import math
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sequence_core import batch_arithmetic_sequences, batch_geometric_sequences
+from sequence_format import FloatFormatter
+from sequence_queries import geometric_term
+
+KINDS = ("arithmetic", "geometric")
+FIELDS = ("kind", "first_term", "step", "num_terms")
+
+def read_rows(stream, input_format):
+    """
+    Parse parameter rows from a text stream.
+    
+    Args:
+        stream: Text stream to read from
+        input_format (str): "csv" or "ndjson"
+    
+    Yields:
+        tuple: (kind, first_term, step, num_terms) for each row
+    """
+    if input_format == "csv":
+        records = csv.DictReader(stream)
+    else:
+        records = (json.loads(line) for line in stream if line.strip())
+    for line_number, record in enumerate(records, start=1):
+        try:
+            kind = record["kind"].strip().lower()
+            if kind not in KINDS:
+                raise ValueError(f"kind must be one of {', '.join(KINDS)}")
+            num_terms = int(record["num_terms"])
+            if num_terms < 0:
+                raise ValueError("num_terms must be non-negative")
+            first_term, step = float(record["first_term"]), float(record["step"])
+            if not (math.isfinite(first_term) and math.isfinite(step)):
+                raise ValueError("first_term and step must be finite")
+            yield kind, first_term, step, num_terms
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"row {line_number}: {e}") from e
+
+def compute_batch(rows):
+    """
+    Compute the sequences for a batch of rows with one vectorized call per kind.
+    
+    Args:
+        rows (list): (kind, first_term, step, num_terms) tuples
+    
+    Returns:
+        list: One float64 array of terms per row, in input order
+    """
+    results = [None] * len(rows)
+    for kind, batch_sequences in (("arithmetic", batch_arithmetic_sequences), ("geometric", batch_geometric_sequences)):
+        positions = [i for i, row in enumerate(rows) if row[0] == kind]
+        if not positions:
+            continue
+        first_terms, steps, num_terms = (np.array([rows[i][field] for i in positions]) for field in (1, 2, 3))
+        values, offsets = batch_sequences(first_terms, steps, num_terms, ragged=True)
+        for position, start, stop in zip(positions, offsets[:-1].tolist(), offsets[1:].tolist()):
+            results[position] = values[start:stop]
+    return results
+
+def encode_batch(rows, output_format, precision=None, notation="general"):
+    """
+    Compute a batch of rows and encode the results for output.
+    
+    Formats:
+        text: one line per row, terms separated by ", "
+        ndjson: one {"kind", "first_term", "step", "num_terms", "terms"} object per line;
+            terms beyond float64 are strings, as in the HTTP service
+        binary: per row, a little-endian uint64 term count followed by float64 terms
+    
+    Returns:
+        bytes: The encoded batch
+    """
+    results = compute_batch(rows)
+    buffer = io.BytesIO()
+    if output_format == "binary":
+        for terms in results:
+            buffer.write(struct.pack("<Q", len(terms)))
+            buffer.write(terms.astype("<f8", copy=False).tobytes())
+    elif output_format == "ndjson":
+        for row, terms in zip(rows, results):
+            values = terms.tolist()
+            # JSON has no inf or nan, so overflowing terms are written as strings
+            for index in np.flatnonzero(~np.isfinite(terms)).tolist():
+                values[index] = str(geometric_term(row[1], row[2], index) if row[0] == "geometric" else values[index])
+            record = dict(zip(FIELDS, row), terms=values)
+            buffer.write(json.dumps(record, allow_nan=False).encode())
+            buffer.write(b"\n")
+    else:
+        formatter = FloatFormatter(precision, notation)
+        for terms in results:
+            buffer.write(formatter.format(terms).encode())
+            buffer.write(b"\n")
+    return buffer.getvalue()
+
+def _encode_batch_args(args):
+    return encode_batch(*args)
+
+def _bounded_map(pool, jobs, max_pending):
+    """Like pool.map, in order, but keeping at most max_pending batches in flight so input streams."""
+    pending = collections.deque()
+    for job in jobs:
+        pending.append(pool.submit(_encode_batch_args, job))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def iter_batches(rows, batch_size):
+    """Group an iterable of rows into lists of at most batch_size rows."""
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compute arithmetic and geometric sequences in bulk.")
+    parser.add_argument("input", nargs="?", default="-", help="Input file, or - for stdin (default)")
+    parser.add_argument("--input-format", choices=("csv", "ndjson"), help="Defaults to the input file extension, else csv")
+    parser.add_argument("--output-format", choices=("text", "ndjson", "binary"), default="text")
+    parser.add_argument("--precision", type=int, help="Digits to keep in text output; default is full precision")
+    parser.add_argument("--notation", choices=("general", "fixed", "scientific"), default="general")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes; 0 uses every CPU")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows computed per vectorized call")
+    args = parser.parse_args(argv)
+    if args.input_format is None:
+        args.input_format = "ndjson" if args.input.endswith((".ndjson", ".jsonl")) else "csv"
+    if args.batch_size <= 0:
+        parser.error("--batch-size must be positive")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    stream = sys.stdin if args.input == "-" else open(args.input, newline="")
+    output = sys.stdout.buffer
+    try:
+        batches = iter_batches(read_rows(stream, args.input_format), args.batch_size)
+        jobs = ((batch, args.output_format, args.precision, args.notation) for batch in batches)
+        workers = args.workers or os.cpu_count() or 1
+        if workers == 1:
+            for encoded in map(_encode_batch_args, jobs):
+                output.write(encoded)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for encoded in _bounded_map(pool, jobs, 2 * workers):
+                    output.write(encoded)
+        output.flush()
+    except ValueError as e:
+        print(f"sequence_cli: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,894 @@
+"""
+Computation and formatting core of the sequence calculator.
+
+Everything here is pure computation on top of NumPy: the sequence engines, the
+lazy sequence classes, streaming and batch generation, and text formatting. It
+does not import Streamlit, so batch workers, the export and store modules and
+the Streamlit UI in app.py can all share it cheaply.
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+from sequence_format import FloatFormatter
+from sequence_queries import FLOAT_MAX_LOG10, ScaledValue, geometric_term
+
+def arithmetic_sequence_array(first_term, common_difference, num_terms, dtype=None):
+    """
+    Build an arithmetic sequence as a NumPy array in a single vectorized operation.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_difference (float): The common difference between consecutive terms
+        num_terms (int): The number of terms to generate
+        dtype (numpy.dtype, optional): Element type of the result. Defaults to the
+            type NumPy infers from first_term and common_difference.
+    
+    Returns:
+        numpy.ndarray: Array of terms in the arithmetic sequence
+    """
+    if dtype is None:
+        dtype = np.result_type(first_term, common_difference)
+    return arithmetic_terms(first_term, common_difference, 0, num_terms, dtype=dtype)
+
+def _term_compute_dtype(dtype):
+    """Return the type arithmetic terms of dtype are computed in."""
+    dtype = np.dtype(dtype)
+    # float32 and smaller cannot even hold the indices past 2**24
+    return np.dtype(np.float64) if dtype.kind == "f" and dtype.itemsize < 8 else dtype
+
+def arithmetic_terms(first_term, common_difference, start, stop, step=1, dtype=np.float64):
+    """
+    Return the arithmetic sequence terms at the indices range(start, stop, step).
+    
+    Terms of floating types narrower than float64 are computed in float64 and
+    rounded once, so every engine gives the same values at any index.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_difference (float): The common difference between consecutive terms
+        start (int): 0-based index of the first term
+        stop (int): Index one past the last term
+        step (int): Index step
+        dtype (numpy.dtype): Element type of the result
+    
+    Returns:
+        numpy.ndarray: The terms a₁ + index·d
+    """
+    sequence = np.arange(start, stop, step, dtype=_term_compute_dtype(dtype))
+    sequence *= common_difference
+    sequence += first_term
+    return sequence.astype(dtype, copy=False)
+
+def _write_memmap(out_path, num_terms, dtype, chunks):
+    """Fill a new .npy file at out_path from chunks and return it as a read-write memmap."""
+    sequence = np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype, shape=(num_terms,))
+    start = 0
+    for chunk in chunks:
+        sequence[start:start + len(chunk)] = chunk
+        start += len(chunk)
+    sequence.flush()
+    return sequence
+
+def open_sequence_file(path, writable=False):
+    """
+    Open a sequence previously written to a .npy file, without reading it into memory.
+    
+    Args:
+        path (str): Path of the .npy file
+        writable (bool): Map the file read-write instead of read-only
+    
+    Returns:
+        numpy.memmap: Zero-copy view of the stored terms
+    """
+    return np.load(path, mmap_mode="r+" if writable else "r")
+
+def calculate_arithmetic_sequence(first_term, common_difference, num_terms, out_path=None):
+    """
+    Calculate arithmetic sequence given first term, common difference, and number of terms.
+    
+    Thin wrapper around arithmetic_sequence_array kept for callers that expect a list.
+    Integer inputs give exact Python ints, even beyond the int64 range.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_difference (float): The common difference between consecutive terms
+        num_terms (int): The number of terms to generate
+        out_path (str, optional): Write the terms chunk by chunk into a memory-mapped
+            .npy file at this path instead, for sequences larger than RAM
+    
+    Returns:
+        list: List of terms in the arithmetic sequence, or a numpy.memmap of the
+        .npy file when out_path is given
+    """
+    if out_path is not None:
+        dtype = np.result_type(first_term, common_difference)
+        chunks = stream_arithmetic_sequence(first_term, common_difference, num_terms, dtype=dtype)
+        return _write_memmap(out_path, num_terms, dtype, chunks)
+    if _is_integral(first_term, common_difference):
+        first_term, common_difference = int(first_term), int(common_difference)
+        int64_max = np.iinfo(np.int64).max
+        largest = max(abs(first_term), abs(max(num_terms - 1, 0) * common_difference))
+        if abs(common_difference) > int64_max or largest + abs(first_term) > int64_max:
+            # int64 could wrap around, or cannot even hold the inputs, so keep
+            # exact Python ints as before
+            return [first_term + i * common_difference for i in range(num_terms)]
+    return arithmetic_sequence_array(first_term, common_difference, num_terms).tolist()
+
+def _is_integral(*values):
+    """Return True if every value is a plain (non-bool) Python or NumPy integer."""
+    return all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values)
+
+def exact_geometric_sequence(first_term, common_ratio, num_terms):
+    """
+    Calculate an integer geometric sequence exactly, one multiplication per term.
+    
+    Args:
+        first_term (int): The first term of the sequence
+        common_ratio (int): The common ratio between consecutive terms
+        num_terms (int): The number of terms to generate
+    
+    Returns:
+        list: List of Python ints in the geometric sequence
+    """
+    sequence = []
+    term = int(first_term)
+    common_ratio = int(common_ratio)
+    for _ in range(num_terms):
+        sequence.append(term)
+        term *= common_ratio
+    return sequence
+
+def _geometric_anchors(first_terms, common_ratios, indices):
+    """
+    Return the terms a₁·r^k at the given indices, broadcasting the three arrays.
+    
+    Where r^k alone leaves the float range although the term may not, the term is
+    evaluated as (a₁·r^h)·r^(k-h), with h chosen so that a₁·r^h is close to 1.
+    """
+    with np.errstate(over="ignore", under="ignore", invalid="ignore", divide="ignore"):
+        powers = np.power(common_ratios, indices)
+        anchors = first_terms * powers
+        magnitudes = np.abs(powers)
+        unsafe = (
+            (magnitudes > np.finfo(anchors.dtype).max) | ((magnitudes < np.finfo(anchors.dtype).tiny) & (common_ratios != 0))
+        ) & np.isfinite(first_terms) & np.isfinite(common_ratios)
+        if unsafe.any():
+            split = np.clip(np.rint(-np.log2(np.abs(first_terms)) / np.log2(np.abs(common_ratios))), 0, indices)
+            split = np.where(unsafe & (first_terms != 0), split, 0)
+            folded = (first_terms * np.power(common_ratios, split)) * np.power(common_ratios, indices - split)
+            # A zero first term stays zero, even where r^k overflows
+            anchors = np.where(unsafe, np.where(first_terms == 0, first_terms, folded), anchors)
+    return anchors
+
+def _block_powers(common_ratios, block, dtype):
+    """
+    Return (powers, shifts) with r^j = powers[..., j]·2^shifts[..., j] for 0 <= j < block.
+    
+    powers is the running product r^0 .. r^(block-1), one row per ratio, and shifts
+    is None. When that product would leave the float range, powers is instead the
+    running product of the binary mantissa of r, which stays close to 1, and shifts
+    carries the power of two. Both forms give bit-identical terms wherever the plain
+    product is in range.
+    """
+    common_ratios = np.asarray(common_ratios, dtype=dtype)[..., None]
+    powers = np.repeat(common_ratios, block, axis=-1)
+    powers[..., 0] = 1
+    with np.errstate(over="ignore", under="ignore", invalid="ignore"):
+        np.cumprod(powers, axis=-1, out=powers)
+    # The last power has the largest or the smallest magnitude
+    last = np.abs(powers[..., -1])
+    in_range = (last <= np.finfo(dtype).max) & ((last >= np.finfo(dtype).tiny) | (common_ratios[..., 0] == 0))
+    if (in_range | ~np.isfinite(common_ratios[..., 0])).all():
+        return powers, None
+    mantissas, exponents = np.frexp(common_ratios)
+    # Centre the mantissas on 1 so that their powers neither overflow nor underflow
+    low = np.abs(mantissas) < np.sqrt(0.5)
+    mantissas = np.where(low, 2 * mantissas, mantissas)
+    exponents = exponents - low
+    powers = np.repeat(mantissas, block, axis=-1)
+    powers[..., 0] = 1
+    np.cumprod(powers, axis=-1, out=powers)
+    return powers, exponents * np.arange(block, dtype=exponents.dtype)
+
+def geometric_sequence_array(first_term, common_ratio, num_terms, dtype=np.float64, anchor_interval=64, offset=0):
+    """
+    Build a geometric sequence as a NumPy array by incremental multiplication.
+    
+    Within each block of anchor_interval terms, every term is the previous one times
+    the ratio (a running product). Each block starts from a true power of the ratio,
+    so rounding drift never accumulates over more than anchor_interval multiplications.
+    Intermediate powers that would overflow or underflow on their own are rescaled,
+    so a term is only inf (or 0) when the term itself is beyond the float range.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        num_terms (int): The number of terms to generate
+        dtype (numpy.dtype): Floating point element type of the result
+        anchor_interval (int): Number of terms between re-anchoring points
+        offset (int): Index of the first term to generate. Anchors sit at the
+            multiples of anchor_interval whatever the offset, so any piece has
+            exactly the same values as the same slice of one call for the whole
+            sequence.
+    
+    Returns:
+        numpy.ndarray: Array of terms in the geometric sequence
+    """
+    sequence = np.empty(num_terms, dtype=dtype)
+    ratio = sequence.dtype.type(common_ratio)
+    if num_terms == 0:
+        return sequence
+    # Position of the first term within its block
+    lead = offset % anchor_interval
+    # Powers r^0 .. r^(block-1) built as a running product, shared by every block
+    powers, shifts = _block_powers(ratio, min(anchor_interval, lead + num_terms), sequence.dtype)
+    head = min(num_terms, anchor_interval - lead) if lead else 0
+    full_blocks, tail = divmod(num_terms - head, anchor_interval)
+    with np.errstate(over="ignore", invalid="ignore"):
+        # One true power per block start, then scale the shared running product
+        anchors = _geometric_anchors(
+            sequence.dtype.type(first_term), ratio,
+            np.arange(offset - lead, offset + num_terms, anchor_interval, dtype=dtype),
+        )
+        if head:
+            # The rest of a block that starts before offset
+            _scale_powers(sequence[:head], anchors[0], powers, shifts, lead)
+            anchors = anchors[1:]
+        if full_blocks:
+            body = sequence[head:head + full_blocks * anchor_interval].reshape(full_blocks, anchor_interval)
+            np.multiply(anchors[:full_blocks, None], powers, out=body)
+            if shifts is not None:
+                np.ldexp(body, shifts, out=body)
+        if tail:
+            _scale_powers(sequence[-tail:], anchors[-1], powers, shifts)
+    return sequence
+
+def _scale_powers(out, anchor, powers, shifts, start=0):
+    """Fill out with anchor times the powers r^start .. r^(start + len(out) - 1)."""
+    stop = start + len(out)
+    np.multiply(powers[start:stop], anchor, out=out)
+    if shifts is not None:
+        np.ldexp(out, shifts[start:stop], out=out)
+
+def geometric_terms_at(first_term, common_ratio, indices, dtype=np.float64, anchor_interval=64):
+    """
+    Evaluate the geometric terms at arbitrary indices.
+    
+    Each term comes from the anchor of its block and the running product within
+    the block, exactly as in geometric_sequence_array, so the values do not
+    depend on which other indices are asked for.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        indices (array_like): Non-negative 0-based term indices
+        dtype (numpy.dtype): Floating point element type of the result
+        anchor_interval (int): Number of terms between re-anchoring points
+    
+    Returns:
+        numpy.ndarray: The terms at the given indices
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    ratio = np.dtype(dtype).type(common_ratio)
+    if indices.size == 0:
+        return np.empty(indices.shape, dtype=dtype)
+    within = indices % anchor_interval
+    powers, shifts = _block_powers(ratio, int(within.max()) + 1, np.dtype(dtype))
+    with np.errstate(over="ignore", invalid="ignore"):
+        terms = _geometric_anchors(np.dtype(dtype).type(first_term), ratio, (indices - within).astype(dtype))
+        terms *= powers[within]
+        if shifts is not None:
+            np.ldexp(terms, shifts[within], out=terms)
+    return terms
+
+def geometric_sequence_log10(first_term, common_ratio, num_terms):
+    """
+    Evaluate a geometric sequence in the log domain, without overflowing.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        num_terms (int): The number of terms to generate
+    
+    Returns:
+        tuple: (signs, log10_magnitudes) arrays; term k is signs[k] × 10^log10_magnitudes[k]
+    """
+    indices = np.arange(num_terms)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log10_magnitudes = np.log10(abs(first_term)) + indices * np.log10(abs(common_ratio))
+        if num_terms:
+            # r^0 is 1 even when r is 0
+            log10_magnitudes[0] = np.log10(abs(first_term))
+    signs = np.full(num_terms, np.sign(first_term), dtype=np.int8)
+    if common_ratio < 0:
+        signs[1::2] *= -1
+    elif common_ratio == 0:
+        signs[1:] = 0
+    return signs, log10_magnitudes
+
+def geometric_overflows(first_term, common_ratio, num_terms):
+    """Return True if the largest float term of the sequence would overflow float64."""
+    if num_terms == 0 or first_term == 0 or abs(common_ratio) <= 1:
+        return False
+    return np.log10(abs(first_term)) + (num_terms - 1) * np.log10(abs(common_ratio)) > FLOAT_MAX_LOG10
+
+def calculate_geometric_sequence(first_term, common_ratio, num_terms, out_path=None):
+    """
+    Calculate geometric sequence given first term, common ratio, and number of terms.
+    
+    Integer inputs are computed exactly; anything else goes through
+    geometric_sequence_array, or through geometric_sequence_log10 when float64
+    would overflow, in which case every term is returned as a ScaledValue.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        num_terms (int): The number of terms to generate
+        out_path (str, optional): Write the terms chunk by chunk into a memory-mapped
+            float64 .npy file at this path instead, for sequences larger than RAM.
+            Terms beyond the float64 range are stored as inf.
+    
+    Returns:
+        list: List of terms in the geometric sequence, or a numpy.memmap of the
+        .npy file when out_path is given
+    """
+    if out_path is not None:
+        chunks = stream_geometric_sequence(first_term, common_ratio, num_terms)
+        return _write_memmap(out_path, num_terms, np.float64, chunks)
+    if _is_integral(first_term, common_ratio):
+        return exact_geometric_sequence(first_term, common_ratio, num_terms)
+    if geometric_overflows(first_term, common_ratio, num_terms):
+        signs, log10_magnitudes = geometric_sequence_log10(first_term, common_ratio, num_terms)
+        return [ScaledValue.from_log10(sign, log10) for sign, log10 in zip(signs.tolist(), log10_magnitudes.tolist())]
+    return geometric_sequence_array(first_term, common_ratio, num_terms).tolist()
+
+def _batch_params(first_terms, steps, num_terms, dtype):
+    """Broadcast batch parameters to 1-D arrays of equal length."""
+    first_terms, steps, num_terms = np.broadcast_arrays(
+        np.asarray(first_terms, dtype=dtype),
+        np.asarray(steps, dtype=dtype),
+        np.asarray(num_terms, dtype=np.int64),
+    )
+    if first_terms.ndim > 1:
+        raise ValueError("Batch parameters must be scalars or 1-D arrays.")
+    first_terms, steps, num_terms = (np.atleast_1d(p) for p in (first_terms, steps, num_terms))
+    if (num_terms < 0).any():
+        raise ValueError("Number of terms must be non-negative.")
+    return first_terms, steps, num_terms
+
+def _batch_result(padded, num_terms, ragged, fill_value):
+    """Turn a rectangular batch into the padded or ragged layout the caller asked for."""
+    mask = np.arange(padded.shape[1]) < num_terms[:, None]
+    if ragged:
+        offsets = np.zeros(len(num_terms) + 1, dtype=np.int64)
+        np.cumsum(num_terms, out=offsets[1:])
+        return padded[mask], offsets
+    if fill_value is None:
+        fill_value = np.nan if padded.dtype.kind in "fc" else 0
+    padded[~mask] = fill_value
+    return padded
+
+def batch_arithmetic_sequences(first_terms, common_differences, num_terms, dtype=np.float64, ragged=False, fill_value=None):
+    """
+    Calculate many arithmetic sequences in one broadcasted NumPy operation.
+    
+    Each parameter may be a scalar or a 1-D array; they are broadcast together, so
+    row i is the sequence for (first_terms[i], common_differences[i], num_terms[i]).
+    
+    Args:
+        first_terms (array_like): First term of each sequence
+        common_differences (array_like): Common difference of each sequence
+        num_terms (array_like): Number of terms in each sequence
+        dtype (numpy.dtype): Element type of the result
+        ragged (bool): Return (values, offsets) instead of a padded 2-D array
+        fill_value (float, optional): Padding for rows shorter than the longest one.
+            Defaults to NaN for floating point dtypes and 0 otherwise.
+    
+    Returns:
+        numpy.ndarray: 2-D array with one padded row per sequence, or, if ragged is
+        True, a tuple (values, offsets) where row i is values[offsets[i]:offsets[i + 1]]
+    """
+    first_terms, common_differences, num_terms = _batch_params(first_terms, common_differences, num_terms, dtype)
+    longest = int(num_terms.max()) if len(num_terms) else 0
+    if ragged and (num_terms != longest).any():
+        # Mixed lengths: evaluate only the wanted terms, as one flat array
+        offsets = np.zeros(len(num_terms) + 1, dtype=np.int64)
+        np.cumsum(num_terms, out=offsets[1:])
+        indices = np.arange(offsets[-1]) - np.repeat(offsets[:-1], num_terms)
+        values = indices.astype(_term_compute_dtype(dtype))
+        values *= np.repeat(common_differences, num_terms)
+        values += np.repeat(first_terms, num_terms)
+        return values.astype(dtype, copy=False), offsets
+    padded = np.arange(longest, dtype=_term_compute_dtype(dtype)) * common_differences[:, None]
+    padded += first_terms[:, None]
+    padded = padded.astype(dtype, copy=False)
+    if (num_terms == longest).all():
+        # Uniform lengths: the rectangle is already the answer
+        return (padded.ravel(), np.arange(len(num_terms) + 1, dtype=np.int64) * longest) if ragged else padded
+    return _batch_result(padded, num_terms, ragged, fill_value)
+
+def batch_geometric_sequences(first_terms, common_ratios, num_terms, dtype=np.float64, ragged=False, fill_value=None, anchor_interval=64):
+    """
+    Calculate many geometric sequences in one broadcasted NumPy operation.
+    
+    Rows use the same blocked running product as geometric_sequence_array and
+    match it exactly.
+    
+    Args:
+        first_terms (array_like): First term of each sequence
+        common_ratios (array_like): Common ratio of each sequence
+        num_terms (array_like): Number of terms in each sequence
+        dtype (numpy.dtype): Floating point element type of the result
+        ragged (bool): Return (values, offsets) instead of a padded 2-D array
+        fill_value (float, optional): Padding for rows shorter than the longest one.
+            Defaults to NaN.
+        anchor_interval (int): Number of terms between re-anchoring points
+    
+    Returns:
+        numpy.ndarray: 2-D array with one padded row per sequence, or, if ragged is
+        True, a tuple (values, offsets) where row i is values[offsets[i]:offsets[i + 1]]
+    """
+    first_terms, common_ratios, num_terms = _batch_params(first_terms, common_ratios, num_terms, dtype)
+    if not len(num_terms):
+        # No rows, so nothing to anchor or reshape
+        empty = np.empty((0, 0), dtype=dtype)
+        return (empty.ravel(), np.zeros(1, dtype=np.int64)) if ragged else empty
+    longest = int(num_terms.max())
+    block = max(min(anchor_interval, longest), 1)
+    num_blocks = -(-longest // block)
+    powers, shifts = _block_powers(common_ratios, block, first_terms.dtype)
+    if ragged and (num_terms != longest).any():
+        # Mixed lengths: evaluate only the wanted terms, as one flat array, from
+        # each row's own anchors; padding every row to the longest one could take
+        # far more memory than the result
+        offsets = np.zeros(len(num_terms) + 1, dtype=np.int64)
+        np.cumsum(num_terms, out=offsets[1:])
+        row_blocks = -(-num_terms // block)
+        block_offsets = np.zeros(len(num_terms) + 1, dtype=np.int64)
+        np.cumsum(row_blocks, out=block_offsets[1:])
+        block_starts = (np.arange(block_offsets[-1]) - np.repeat(block_offsets[:-1], row_blocks)) * block
+        rows = np.repeat(np.arange(len(num_terms)), num_terms)
+        indices = np.arange(offsets[-1]) - offsets[:-1][rows]
+        with np.errstate(over="ignore", invalid="ignore"):
+            anchors = _geometric_anchors(
+                np.repeat(first_terms, row_blocks), np.repeat(common_ratios, row_blocks), block_starts.astype(dtype)
+            )
+            values = anchors[block_offsets[:-1][rows] + indices // block] * powers[rows, indices % block]
+            if shifts is not None:
+                np.ldexp(values, shifts[rows, indices % block], out=values)
+        return values, offsets
+    with np.errstate(over="ignore", invalid="ignore"):
+        starts = np.arange(0, num_blocks * block, block, dtype=dtype)
+        anchors = _geometric_anchors(first_terms[:, None], common_ratios[:, None], starts)
+        padded = anchors[:, :, None] * powers[:, None, :]
+        if shifts is not None:
+            np.ldexp(padded, shifts[:, None, :], out=padded)
+        padded = padded.reshape(len(num_terms), -1)[:, :longest]
+    if (num_terms == longest).all():
+        return (padded.ravel(), np.arange(len(num_terms) + 1, dtype=np.int64) * longest) if ragged else padded
+    return _batch_result(padded, num_terms, ragged, fill_value)
+
+DEFAULT_CHUNK_SIZE = 65536
+
+def _chunk_bounds(num_terms, chunk_size):
+    """Yield (start, stop) index pairs covering num_terms terms, or forever if num_terms is None."""
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be a positive integer.")
+    start = 0
+    while num_terms is None or start < num_terms:
+        stop = start + chunk_size if num_terms is None else min(start + chunk_size, num_terms)
+        yield start, stop
+        start = stop
+
+def stream_arithmetic_sequence(first_term, common_difference, num_terms=None, chunk_size=DEFAULT_CHUNK_SIZE, dtype=None):
+    """
+    Generate an arithmetic sequence as a stream of fixed-size NumPy chunks.
+    
+    Only one chunk is alive inside the generator at a time, so memory use is
+    constant no matter how many terms are produced. Chunks can be written with
+    ndarray.tofile, sent with socket.sendall(chunk), or folded into a reducer.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_difference (float): The common difference between consecutive terms
+        num_terms (int, optional): The number of terms to generate. None streams forever.
+        chunk_size (int): Number of terms per chunk; the last chunk may be shorter
+        dtype (numpy.dtype, optional): Element type of the chunks
+    
+    Yields:
+        numpy.ndarray: Consecutive chunks of the sequence
+    """
+    if dtype is None:
+        dtype = np.result_type(first_term, common_difference)
+    for start, stop in _chunk_bounds(num_terms, chunk_size):
+        yield arithmetic_terms(first_term, common_difference, start, stop, dtype=dtype)
+
+def stream_geometric_sequence(first_term, common_ratio, num_terms=None, chunk_size=DEFAULT_CHUNK_SIZE, dtype=np.float64):
+    """
+    Generate a geometric sequence as a stream of fixed-size NumPy chunks.
+    
+    Terms are anchored on true powers of the ratio at fixed indices, so drift
+    does not carry over from one chunk to the next, and whatever the chunk_size
+    the chunks match geometric_sequence_array exactly.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        num_terms (int, optional): The number of terms to generate. None streams forever.
+        chunk_size (int): Number of terms per chunk; the last chunk may be shorter
+        dtype (numpy.dtype): Floating point element type of the chunks
+    
+    Yields:
+        numpy.ndarray: Consecutive chunks of the sequence
+    """
+    for start, stop in _chunk_bounds(num_terms, chunk_size):
+        yield geometric_sequence_array(first_term, common_ratio, stop - start, dtype, offset=start)
+
+class _LazySequence:
+    """
+    Shared range-like behaviour for lazily evaluated sequences.
+    
+    A sequence keeps only its defining parameters and a range of term indices, so
+    length, indexing, slicing and reversal are all O(1). Subclasses provide _term,
+    which computes the term at a given index of the unsliced sequence.
+    """
+    
+    def __init__(self, num_terms, indices=None):
+        if num_terms < 0:
+            raise ValueError("Number of terms must be non-negative.")
+        self.num_terms = num_terms
+        self._indices = range(num_terms) if indices is None else indices
+    
+    def _params(self):
+        raise NotImplementedError
+    
+    def _term(self, index):
+        raise NotImplementedError
+    
+    def _with_indices(self, indices):
+        return type(self)(*self._params(), indices=indices)
+    
+    def __len__(self):
+        return len(self._indices)
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._with_indices(self._indices[key])
+        return self._term(self._indices[key])
+    
+    def __iter__(self):
+        for index in self._indices:
+            yield self._term(index)
+    
+    def __reversed__(self):
+        return iter(self[::-1])
+    
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._params() == other._params() and self._indices == other._indices
+    
+    def __hash__(self):
+        return hash((type(self), self._params(), self._indices))
+    
+    def __repr__(self):
+        params = ", ".join(repr(p) for p in self._params())
+        text = f"{type(self).__name__}({params})"
+        if self._indices != range(self.num_terms):
+            text += f"[{self._indices.start}:{self._indices.stop}:{self._indices.step}]"
+        return text
+    
+    def _index_array(self, dtype):
+        indices = self._indices
+        return np.arange(indices.start, indices.stop, indices.step, dtype=dtype)
+    
+    def tolist(self):
+        """Materialize the selected terms as a list."""
+        return list(self)
+
+class ArithmeticSequence(_LazySequence):
+    """
+    Lazy arithmetic sequence that behaves like Python's range.
+    
+    Terms are computed on demand from (first_term, common_difference, num_terms);
+    nothing is stored per term until tolist or to_array is called.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_difference (float): The common difference between consecutive terms
+        num_terms (int): The number of terms in the sequence
+    """
+    
+    def __init__(self, first_term, common_difference, num_terms, indices=None):
+        super().__init__(num_terms, indices)
+        self.first_term = first_term
+        self.common_difference = common_difference
+    
+    def _params(self):
+        return (self.first_term, self.common_difference, self.num_terms)
+    
+    def _term(self, index):
+        return self.first_term + (index * self.common_difference)
+    
+    def to_array(self, dtype=None):
+        """Materialize the selected terms as a NumPy array."""
+        if dtype is None:
+            dtype = np.result_type(self.first_term, self.common_difference)
+        indices = self._indices
+        return arithmetic_terms(self.first_term, self.common_difference, indices.start, indices.stop, indices.step, dtype)
+    
+    def tolist(self):
+        """Materialize the selected terms as a list."""
+        if _is_integral(self.first_term, self.common_difference):
+            return list(self)
+        return self.to_array().tolist()
+
+class GeometricSequence(_LazySequence):
+    """
+    Lazy geometric sequence that behaves like Python's range.
+    
+    Terms are computed on demand from (first_term, common_ratio, num_terms);
+    nothing is stored per term until tolist or to_array is called.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        num_terms (int): The number of terms in the sequence
+    """
+    
+    def __init__(self, first_term, common_ratio, num_terms, indices=None):
+        super().__init__(num_terms, indices)
+        self.first_term = first_term
+        self.common_ratio = common_ratio
+    
+    def _params(self):
+        return (self.first_term, self.common_ratio, self.num_terms)
+    
+    def _term(self, index):
+        return geometric_term(self.first_term, self.common_ratio, index)
+    
+    def to_array(self, dtype=np.float64):
+        """Materialize the selected terms as a NumPy array."""
+        # Both paths anchor at absolute indices, so a term has the same value in
+        # every slice that contains it
+        indices = self._indices
+        if indices.step == 1:
+            return geometric_sequence_array(self.first_term, self.common_ratio, len(indices), dtype, offset=indices.start)
+        return geometric_terms_at(self.first_term, self.common_ratio, self._index_array(np.int64), dtype)
+    
+    def tolist(self):
+        """Materialize the selected terms as a list."""
+        indices = self._indices
+        if _is_integral(self.first_term, self.common_ratio):
+            if indices.step == 1:
+                return exact_geometric_sequence(self._term(indices.start), self.common_ratio, len(indices))
+            return list(self)
+        if indices and geometric_overflows(self.first_term, self.common_ratio, max(indices[0], indices[-1]) + 1):
+            return list(self)
+        return self.to_array().tolist()
+
+def iter_sequence_text(sequence, chunk_size=DEFAULT_CHUNK_SIZE, head=None, tail=None, separator=", ", formatter=None):
+    """
+    Render a sequence as text, one chunk of terms at a time.
+    
+    Works with lists, NumPy arrays and the lazy sequence classes. Each chunk is
+    converted to Python numbers in bulk with tolist and formatted by a
+    FloatFormatter, so only one chunk of text is alive at once.
+    
+    Args:
+        sequence: Any sliceable sequence of terms with a length
+        chunk_size (int): Number of terms rendered per piece
+        head (int, optional): With tail, keep only this many leading terms
+        tail (int, optional): With head, keep only this many trailing terms;
+            the terms in between are replaced by "..."
+        separator (str): Text placed between terms
+        formatter (FloatFormatter, optional): Controls precision and notation.
+            Defaults to full precision, matching str() of each term.
+    
+    Yields:
+        str: Consecutive pieces of the rendered text
+    """
+    if formatter is None:
+        formatter = FloatFormatter(separator=separator)
+    num_terms = len(sequence)
+    if head is not None and tail is not None and head + tail < num_terms:
+        windows = [(0, head), (num_terms - tail, num_terms)]
+    else:
+        windows = [(0, num_terms)]
+    wrote_terms = False
+    for window_index, (window_start, window_stop) in enumerate(windows):
+        if window_index:
+            yield separator + "..." if wrote_terms else "..."
+            wrote_terms = True
+        for start in range(window_start, window_stop, chunk_size):
+            chunk = sequence[start:min(start + chunk_size, window_stop)]
+            if hasattr(chunk, "tolist"):
+                chunk = chunk.tolist()
+            # Pieces after the first already start with the separator
+            for piece_index, text in enumerate(formatter.iter_format(chunk)):
+                yield separator + text if wrote_terms and not piece_index else text
+                wrote_terms = True
+
+def write_sequence_text(sequence, sink, **options):
+    """
+    Stream the text of a sequence into a writable sink.
+    
+    Args:
+        sequence: Any sliceable sequence of terms with a length
+        sink: Object with a write(str) method, e.g. an open text file or
+            socket.makefile("w")
+        **options: chunk_size, head, tail, separator and formatter, as for
+            iter_sequence_text
+    """
+    for piece in iter_sequence_text(sequence, **options):
+        sink.write(piece)
+
+class SequenceTextPrefix:
+    """
+    Formatted text of the leading terms of one sequence, grown and cut in place.
+    
+    The text is held in blocks together with the end offset of every term, so any
+    window of it can be sliced out without reformatting. Growing the prefix
+    formats only the new terms, plus the rest of a partial last block. Shrinking
+    it just lowers num_terms and keeps the text, so growing back again is free.
+    The text is the same as iter_sequence_text(sequence, chunk_size=block_size)
+    of the whole prefix.
+    
+    Args:
+        sequence_class: ArithmeticSequence or GeometricSequence
+        first_term (float): The first term of the sequence
+        step (float): The common difference or common ratio
+        block_size (int): Number of terms formatted per block; it also bounds how
+            many already formatted terms growing the prefix may format again
+    """
+    
+    separator = ", "
+    
+    def __init__(self, sequence_class, first_term, step, block_size=1024):
+        self.params = (sequence_class, first_term, step)
+        self.num_terms = 0
+        self.block_size = block_size
+        self._formatter = FloatFormatter(separator=self.separator)
+        self._block_starts = []
+        self._block_texts = []
+        self._block_ends = []
+        self._formatted = 0
+    
+    def __len__(self):
+        return self.num_terms
+    
+    @property
+    def formatted_terms(self):
+        """Number of terms whose text is held, including any cut off by resize."""
+        return self._formatted
+    
+    def _append_block(self, start, stop):
+        sequence_class, first_term, step = self.params
+        text = self._formatter.format(sequence_class(first_term, step, stop)[start:stop].tolist())
+        # Terms are numbers and never contain a comma, so every comma starts a separator
+        commas = np.flatnonzero(np.frombuffer(text.encode("ascii"), dtype=np.uint8) == ord(","))
+        self._block_starts.append(start)
+        self._block_texts.append(text)
+        self._block_ends.append(np.append(commas, len(text)).astype(np.int32))
+    
+    def resize(self, num_terms):
+        """
+        Set the number of terms in the prefix.
+        
+        Args:
+            num_terms (int): The new number of terms; terms not yet formatted are
+                formatted and appended, fewer terms just hides the rest
+        """
+        if num_terms < 0:
+            raise ValueError("Number of terms must be non-negative.")
+        if num_terms > self._formatted and self._formatted % self.block_size:
+            # Blocks start at multiples of block_size whatever the resize history,
+            # so a partial last block is formatted again together with the new terms
+            self._formatted = self._block_starts.pop()
+            del self._block_texts[-1], self._block_ends[-1]
+        for start in range(self._formatted, num_terms, self.block_size):
+            self._append_block(start, min(start + self.block_size, num_terms))
+        self._formatted = max(self._formatted, num_terms)
+        self.num_terms = num_terms
+    
+    def text(self, start=0, stop=None):
+        """
+        Return the text of terms start..stop-1 of the prefix.
+        
+        Args:
+            start (int): Index of the first term
+            stop (int, optional): Index after the last term; defaults to num_terms
+        
+        Returns:
+            str: The terms joined by the separator
+        """
+        stop = self.num_terms if stop is None else min(stop, self.num_terms)
+        if not 0 <= start <= stop:
+            raise IndexError("Window is outside the prefix.")
+        pieces = []
+        block = bisect_right(self._block_starts, start) - 1
+        while start < stop:
+            block_start = self._block_starts[block]
+            ends = self._block_ends[block]
+            first, last = start - block_start, min(stop - block_start, len(ends)) - 1
+            text_start = ends[first - 1] + len(self.separator) if first else 0
+            pieces.append(self._block_texts[block][text_start:ends[last]])
+            start = block_start + last + 1
+            block += 1
+        return self.separator.join(pieces)
+
+def arithmetic_formula(first_term, common_difference):
+    """
+    Build the general formula of an arithmetic sequence.
+    
+    Args:
+        first_term (float): The first term
+        common_difference (float): The common difference
+    
+    Returns:
+        str: The formula, e.g. "aₙ = 1.0 + 2.0(n-1)"
+    """
+    formula = f"aₙ = {first_term}"
+    if common_difference > 0:
+        formula += f" + {common_difference}(n-1)"
+    elif common_difference < 0:
+        formula += f" - {abs(common_difference)}(n-1)"
+    else:
+        formula += " + 0(n-1)"
+    return formula
+
+def geometric_formula(first_term, common_ratio):
+    """
+    Build the general formula of a geometric sequence.
+    
+    Args:
+        first_term (float): The first term
+        common_ratio (float): The common ratio
+    
+    Returns:
+        str: The formula, e.g. "aₙ = 1.0 × 2.0^(n-1)"
+    """
+    if common_ratio == 1:
+        return f"aₙ = {first_term}"
+    return f"aₙ = {first_term} × {common_ratio}^(n-1)"
+
+def format_arithmetic_display(sequence, first_term, common_difference):
+    """
+    Format the arithmetic sequence for display with additional information.
+    
+    Args:
+        sequence (list): The arithmetic sequence
+        first_term (float): The first term
+        common_difference (float): The common difference
+    
+    Returns:
+        tuple: (sequence_str, formula)
+    """
+    # Create the sequence string
+    sequence_str = "".join(iter_sequence_text(sequence))
+    
+    # Add formula information
+    formula = arithmetic_formula(first_term, common_difference)
+    
+    return sequence_str, formula
+
+def format_geometric_display(sequence, first_term, common_ratio):
+    """
+    Format the geometric sequence for display with additional information.
+    
+    Args:
+        sequence (list): The geometric sequence
+        first_term (float): The first term
+        common_ratio (float): The common ratio
+    
+    Returns:
+        tuple: (sequence_str, formula)
+    """
+    # Create the sequence string
+    sequence_str = "".join(iter_sequence_text(sequence))
+    
+    # Add formula information
+    formula = geometric_formula(first_term, common_ratio)
+    
+    return sequence_str, formula
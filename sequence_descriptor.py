@@ -0,0 +1,146 @@
+"""
+Parametric descriptor files for arithmetic and geometric sequences.
+
+A sequence is fully described by (kind, first_term, step, num_terms, dtype), so
+instead of shipping n values a descriptor stores just those parameters as one
+line of JSON, plus a CRC-32 checksum of them. Reading a descriptor gives a
+SequenceDescriptor, a lazy array-like that computes any index or range on demand
+with the same term formulas as the rest of the app.
+
+Example file contents for 1.0, 3.0, 5.0, ... (10 terms):
+    {"checksum": 551783003, "dtype": "<f8", "first_term": 1.0, "format": "sequence-descriptor", "kind": "arithmetic", "num_terms": 10, "step": 2.0, "version": 1}
+"""
+import json
+import zlib
+
+import numpy as np
+
+from sequence_core import ArithmeticSequence, GeometricSequence
+
+FORMAT_NAME = "sequence-descriptor"
+FORMAT_VERSION = 1
+FILE_EXTENSION = ".seqd"
+
+_SEQUENCE_CLASSES = {"arithmetic": ArithmeticSequence, "geometric": GeometricSequence}
+
+def _checksum(params):
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return zlib.crc32(canonical.encode())
+
+class SequenceDescriptor:
+    """
+    Lazy, read-only array-like view of a sequence described by its parameters.
+    
+    Indexing with an int returns one term; indexing with a slice materializes just
+    that range as a NumPy array. np.asarray(descriptor) materializes everything.
+    
+    Args:
+        kind (str): "arithmetic" or "geometric"
+        first_term (float): The first term of the sequence
+        step (float): The common difference or common ratio
+        num_terms (int): The number of terms
+        dtype (numpy.dtype): Element type of materialized ranges
+    """
+    
+    def __init__(self, kind, first_term, step, num_terms, dtype=np.float64):
+        if kind not in _SEQUENCE_CLASSES:
+            raise ValueError(f"Sequence kind must be one of {', '.join(_SEQUENCE_CLASSES)}.")
+        self.kind = kind
+        self.first_term = first_term
+        self.step = step
+        self.num_terms = num_terms
+        self.dtype = np.dtype(dtype)
+        self._sequence = _SEQUENCE_CLASSES[kind](first_term, step, num_terms)
+    
+    @property
+    def shape(self):
+        return (self.num_terms,)
+    
+    def __len__(self):
+        return self.num_terms
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._sequence[key].to_array(self.dtype)
+        return self.dtype.type(self._sequence[key])
+    
+    def __array__(self, dtype=None, copy=None):
+        return self._sequence.to_array(dtype or self.dtype)
+    
+    def __repr__(self):
+        return (f"SequenceDescriptor({self.kind!r}, {self.first_term!r}, {self.step!r}, "
+                f"{self.num_terms!r}, dtype={self.dtype.str!r})")
+    
+    def params(self):
+        """Return the parameters as the dict stored in a descriptor."""
+        return {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "kind": self.kind,
+            "first_term": self.first_term,
+            "step": self.step,
+            "num_terms": self.num_terms,
+            "dtype": self.dtype.str,
+        }
+    
+    def encode(self):
+        """Serialize the descriptor to bytes."""
+        params = self.params()
+        params["checksum"] = _checksum(params)
+        return json.dumps(params, sort_keys=True).encode() + b"\n"
+
+def decode_descriptor(data):
+    """
+    Parse descriptor bytes, verifying the format and checksum.
+    
+    Args:
+        data (bytes): Output of SequenceDescriptor.encode
+    
+    Returns:
+        SequenceDescriptor: The lazy sequence
+    """
+    try:
+        params = json.loads(data)
+    except ValueError as e:
+        raise ValueError("Not a sequence descriptor: invalid JSON.") from e
+    if not isinstance(params, dict) or params.get("format") != FORMAT_NAME:
+        raise ValueError("Not a sequence descriptor.")
+    if params.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported sequence descriptor version {params.get('version')!r}.")
+    checksum = params.pop("checksum", None)
+    if checksum != _checksum(params):
+        raise ValueError("Sequence descriptor checksum mismatch; the file is corrupt.")
+    return SequenceDescriptor(params["kind"], params["first_term"], params["step"], params["num_terms"], params["dtype"])
+
+def write_descriptor(path, kind, first_term, step, num_terms, dtype=np.float64):
+    """
+    Write a descriptor file for a sequence.
+    
+    Args:
+        path (str): Destination path, conventionally ending in .seqd
+        kind (str): "arithmetic" or "geometric"
+        first_term (float): The first term of the sequence
+        step (float): The common difference or common ratio
+        num_terms (int): The number of terms
+        dtype (numpy.dtype): Element type of materialized ranges
+    
+    Returns:
+        SequenceDescriptor: The descriptor that was written
+    """
+    descriptor = SequenceDescriptor(kind, first_term, step, num_terms, dtype)
+    with open(path, "wb") as f:
+        f.write(descriptor.encode())
+    return descriptor
+
+def read_descriptor(path):
+    """
+    Read a descriptor file written by write_descriptor.
+    
+    Args:
+        path (str): Path of the descriptor file
+    
+    Returns:
+        SequenceDescriptor: The lazy sequence
+    """
+    with open(path, "rb") as f:
+        return decode_descriptor(f.read())
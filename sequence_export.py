@@ -0,0 +1,177 @@
+"""
+Streaming export of sequences to CSV, NPY, Arrow IPC and Parquet.
+
+Every writer consumes an iterable of NumPy chunks, such as the ones from
+stream_arithmetic_sequence and stream_geometric_sequence, and writes each chunk
+to a binary sink before pulling the next one. The whole sequence is never held
+in memory. Arrow IPC and Parquet need the optional pyarrow package.
+"""
+import importlib.util
+import os
+import tempfile
+
+import numpy as np
+
+from sequence_format import FloatFormatter
+
+COLUMN_NAME = "term"
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Arrow and Parquet export need the pyarrow package (pip install pyarrow).") from e
+    return pyarrow
+
+def write_csv(chunks, sink, formatter=None):
+    """
+    Write chunks as a one-column CSV file with a header row.
+    
+    Args:
+        chunks (iterable): NumPy arrays of consecutive terms
+        sink: Binary file-like object with a write(bytes) method
+        formatter (FloatFormatter, optional): Controls precision and notation of the
+            terms. Defaults to full precision.
+    """
+    if formatter is None:
+        formatter = FloatFormatter(separator="\n")
+    elif formatter.separator != "\n":
+        formatter = FloatFormatter(formatter.precision, formatter.notation, "\n", formatter.block_size)
+    sink.write(f"{COLUMN_NAME}\n".encode())
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        # Pieces after the first already start with the newline separator
+        for text in formatter.iter_format(chunk):
+            sink.write(text.encode())
+        sink.write(b"\n")
+
+def write_npy(chunks, sink, num_terms, dtype=np.float64):
+    """
+    Write chunks as a 1-D .npy file.
+    
+    The .npy header records the array shape, so num_terms must be known up front.
+    
+    Args:
+        chunks (iterable): NumPy arrays of consecutive terms
+        sink: Binary file-like object with a write(bytes) method
+        num_terms (int): Total number of terms the chunks add up to
+        dtype (numpy.dtype): Element type written to the file
+    """
+    dtype = np.dtype(dtype)
+    header = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (num_terms,)}
+    np.lib.format.write_array_header_1_0(sink, header)
+    written = 0
+    for chunk in chunks:
+        chunk = np.ascontiguousarray(chunk, dtype=dtype)
+        sink.write(chunk.data)
+        written += len(chunk)
+    if written != num_terms:
+        raise ValueError(f"Expected {num_terms} terms for the .npy header but the chunks held {written}.")
+
+def write_arrow(chunks, sink):
+    """
+    Write chunks as an Arrow IPC stream with one record batch per chunk.
+    
+    Args:
+        chunks (iterable): NumPy arrays of consecutive terms
+        sink: Binary file-like object with a write(bytes) method
+    """
+    pa = _require_pyarrow()
+    writer = None
+    try:
+        for chunk in chunks:
+            batch = pa.record_batch([pa.array(chunk)], names=[COLUMN_NAME])
+            if writer is None:
+                writer = pa.ipc.new_stream(sink, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_parquet(chunks, sink):
+    """
+    Write chunks as a Parquet file with one row group per chunk.
+    
+    Args:
+        chunks (iterable): NumPy arrays of consecutive terms
+        sink: Binary file-like object with a write(bytes) method
+    """
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.table({COLUMN_NAME: chunk})
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+# Format name -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "npy": (".npy", "application/octet-stream"),
+    "arrow": (".arrows", "application/vnd.apache.arrow.stream"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+def available_export_formats():
+    """Return the export formats usable with the packages installed."""
+    has_pyarrow = importlib.util.find_spec("pyarrow") is not None
+    return [fmt for fmt in EXPORT_FORMATS if has_pyarrow or fmt not in ("arrow", "parquet")]
+
+def export_sequence(chunks, sink, fmt, num_terms=None, dtype=np.float64):
+    """
+    Stream chunks of a sequence to sink in the given format.
+    
+    Args:
+        chunks (iterable): NumPy arrays of consecutive terms
+        sink: Binary file-like object with a write(bytes) method
+        fmt (str): One of "csv", "npy", "arrow" or "parquet"
+        num_terms (int, optional): Total number of terms; required for "npy"
+        dtype (numpy.dtype): Element type for "npy"
+    """
+    if fmt == "csv":
+        write_csv(chunks, sink)
+    elif fmt == "npy":
+        if num_terms is None:
+            raise ValueError("The npy format needs num_terms.")
+        write_npy(chunks, sink, num_terms, dtype)
+    elif fmt == "arrow":
+        write_arrow(chunks, sink)
+    elif fmt == "parquet":
+        write_parquet(chunks, sink)
+    else:
+        raise ValueError(f"Export format must be one of {', '.join(EXPORT_FORMATS)}.")
+
+def export_to_temp_file(chunks, fmt, num_terms=None, dtype=np.float64):
+    """
+    Stream chunks of a sequence into a new temporary file on disk.
+    
+    Open the result with open(path, "rb") to pass it on: Streamlit's
+    download_button only accepts str, bytes, BytesIO or real binary files, not
+    tempfile's wrapper objects. Streamlit still reads the file into memory when
+    the download is served.
+    
+    Args:
+        chunks (iterable): NumPy arrays of consecutive terms
+        fmt (str): One of "csv", "npy", "arrow" or "parquet"
+        num_terms (int, optional): Total number of terms; required for "npy"
+        dtype (numpy.dtype): Element type for "npy"
+    
+    Returns:
+        str: Path of the file; the caller removes it when done. If the export
+            fails or is interrupted, the file is removed and the error re-raised.
+    """
+    extension, _ = EXPORT_FORMATS[fmt]
+    with tempfile.NamedTemporaryFile(suffix=extension, delete=False) as sink:
+        try:
+            export_sequence(chunks, sink, fmt, num_terms, dtype)
+        except BaseException:
+            sink.close()
+            os.unlink(sink.name)
+            raise
+    return sink.name
@@ -0,0 +1,133 @@
+"""
+Background generation jobs with progress reporting and cancellation.
+
+A GenerationJob streams a sequence into an export file on its own thread, so the
+Streamlit script thread never blocks on a large generation. The UI polls
+progress and the preview of the first terms while the job runs. When the inputs
+change, the UI cancels the job, and it stops at the next chunk boundary.
+
+The worker thread only holds the job's shared state, never the GenerationJob
+itself. When a session ends and its job is garbage collected, the job is
+cancelled and its file removed, as if cancel() had been called.
+"""
+import os
+import threading
+import weakref
+
+from sequence_core import iter_sequence_text
+from sequence_export import export_to_temp_file
+
+class JobCancelled(Exception):
+    """Raised inside a job's thread when the job has been cancelled."""
+
+class _JobState:
+    """Progress and result shared between a GenerationJob and its worker thread."""
+    
+    def __init__(self):
+        self.terms_done = 0
+        self.preview = ""
+        self.error = None
+        self.path = None
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+
+def _tracked(state, chunks, preview_terms):
+    for chunk in chunks:
+        if state.cancelled.is_set():
+            raise JobCancelled()
+        yield chunk
+        if state.terms_done < preview_terms:
+            head = chunk[:preview_terms - state.terms_done]
+            state.preview += ("" if not state.terms_done else ", ") + "".join(iter_sequence_text(head))
+        state.terms_done += len(chunk)
+
+def _run_job(state, chunks, num_terms, fmt, preview_terms):
+    try:
+        path = export_to_temp_file(_tracked(state, chunks, preview_terms), fmt, num_terms)
+    except JobCancelled:
+        pass
+    except Exception as e:
+        state.error = e
+    else:
+        with state.lock:
+            if state.cancelled.is_set():
+                os.unlink(path)
+            else:
+                state.path = path
+    finally:
+        state.finished.set()
+
+def _discard_job(state):
+    with state.lock:
+        state.cancelled.set()
+        path, state.path = state.path, None
+    if path is not None:
+        os.unlink(path)
+
+class GenerationJob:
+    """
+    Stream chunks of a sequence into an export file on a background thread.
+    
+    Args:
+        key (tuple): Identifies the inputs the job was started for
+        chunks (iterable): NumPy arrays of consecutive terms
+        num_terms (int): Total number of terms the chunks add up to
+        fmt (str): Export format, as for export_sequence
+        preview_terms (int): Number of leading terms kept as preview text
+    """
+    
+    def __init__(self, key, chunks, num_terms, fmt, preview_terms=100):
+        self.key = key
+        self.num_terms = num_terms
+        self.fmt = fmt
+        self._state = _JobState()
+        self._discard = weakref.finalize(self, _discard_job, self._state)
+        self._thread = threading.Thread(
+            target=_run_job, args=(self._state, chunks, num_terms, fmt, preview_terms), daemon=True
+        )
+    
+    def start(self):
+        self._thread.start()
+        return self
+    
+    def cancel(self):
+        """Stop the job before it writes its next chunk, and remove its file."""
+        self._discard()
+    
+    @property
+    def cancelled(self):
+        return self._state.cancelled.is_set()
+    
+    @property
+    def done(self):
+        """True once the job has finished, failed or stopped after cancellation."""
+        return self._state.finished.is_set()
+    
+    @property
+    def terms_done(self):
+        return self._state.terms_done
+    
+    @property
+    def preview(self):
+        """Text of the leading terms written so far."""
+        return self._state.preview
+    
+    @property
+    def error(self):
+        """The exception the job failed with, or None."""
+        return self._state.error
+    
+    @property
+    def progress(self):
+        """Fraction of the terms written so far, between 0 and 1."""
+        return self.terms_done / self.num_terms if self.num_terms else 1.0
+    
+    def read_file(self):
+        """Open the finished export file for reading, as a binary file object."""
+        if self._state.path is None:
+            raise RuntimeError("The export job has no finished file.")
+        return open(self._state.path, "rb")
+    
+    def wait(self, timeout=None):
+        return self._state.finished.wait(timeout)
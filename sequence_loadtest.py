@@ -0,0 +1,181 @@
+"""
+Load test for the sequence HTTP service.
+
+Opens a number of keep-alive connections, sends requests on all of them
+concurrently for a fixed duration, and reports throughput and p50/p99 latency.
+By default it starts its own server, in a separate process on a free localhost
+port, so it needs nothing else running and the client does not share an event
+loop with the server it measures; pass --port to target an already running
+server.
+
+Example:
+    python sequence_loadtest.py --connections 32 --duration 10 --path "/sequence?first_term=1&step=2&num_terms=100"
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sequence_server.py")
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+def _free_port(host):
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+def _get(host, port, path, timeout=5.0):
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        data = b""
+        while True:
+            block = sock.recv(65536)
+            if not block:
+                break
+            data += block
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split()[1]), body
+
+def start_server_process(host="127.0.0.1", server_args=(), timeout=30.0):
+    """
+    Start sequence_server.py in a child process and wait until it answers /health.
+    
+    Args:
+        host (str): Interface to bind
+        server_args (sequence): Extra command-line arguments for the server
+        timeout (float): Seconds to wait for the server to come up
+    
+    Returns:
+        tuple: The subprocess.Popen object and the port the server listens on
+    """
+    port = _free_port(host)
+    process = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, "--host", host, "--port", str(port), *server_args],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"sequence server exited with status {process.returncode}")
+        try:
+            if _get(host, port, "/health")[0] == 200:
+                return process, port
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            stop_server_process(process)
+            raise RuntimeError("sequence server did not start in time")
+        time.sleep(0.05)
+
+def stop_server_process(process, timeout=10.0):
+    """Stop a server started by start_server_process and wait for it to exit."""
+    # SIGINT lets the server shut its worker pool down cleanly
+    if os.name == "posix":
+        process.send_signal(signal.SIGINT)
+    else:
+        process.terminate()
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+async def _client(host, port, request, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+def percentile(sorted_values, fraction):
+    """Return the value at the given fraction (0-1) of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+async def run_load_test(host, port, path, connections, duration):
+    """
+    Drive the server and return a dict of throughput and latency statistics.
+    
+    Args:
+        host (str): Server host
+        port (int): Server port
+        path (str): Request target, e.g. "/sum?kind=geometric&first_term=1&step=2&num_terms=10"
+        connections (int): Number of concurrent keep-alive connections
+        duration (float): Seconds to run for
+    """
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1")
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_client(host, port, request, deadline, latencies, errors) for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+    }
+
+def _main(args):
+    process = None
+    port = args.port
+    if port is None:
+        server_args = ["--batch-window", str(args.batch_window)]
+        if args.workers is not None:
+            server_args += ["--workers", str(args.workers)]
+        process, port = start_server_process(args.host, server_args)
+    try:
+        stats = asyncio.run(run_load_test(args.host, port, args.path, args.connections, args.duration))
+        batching = json.loads(_get(args.host, port, "/stats")[1])["batching"]
+    finally:
+        if process is not None:
+            stop_server_process(process)
+    print(f"{stats['requests']:,} requests in {args.duration:g} s over {args.connections} connections "
+          f"({stats['errors']} errors)")
+    print(f"throughput {stats['requests_per_second']:,.0f} req/s  p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms")
+    if batching is not None:
+        print(f"micro-batching: {batching['batches']:,} batches, mean size {batching['mean_batch_size']:.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the sequence HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="Port of a running server; by default one is started in a child process")
+    parser.add_argument("--workers", type=int, help="Worker processes of the started server")
+    parser.add_argument("--batch-window", type=float, default=0.001,
+                        help="Micro-batching window of the started server in seconds; 0 disables it")
+    parser.add_argument("--path", default="/sequence?kind=arithmetic&first_term=1&step=2&num_terms=100")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    _main(parser.parse_args(argv))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Process-pool sharded generation for very large sequences.
+
+Any term is a closed-form function of its index, so the index range is split into
+shards that worker processes fill independently, writing straight into one
+shared-memory buffer. Shard boundaries fall on the geometric engine's anchor
+points, so the result is identical to the single-core engines.
+
+The shared segment is copied into an ordinary array before it is released, so
+the peak memory is twice the result. With out_path, the workers write into a
+memory-mapped .npy file instead, and nothing is copied.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from sequence_core import arithmetic_terms, geometric_sequence_array, open_sequence_file
+
+# Shard boundaries are multiples of this, matching geometric_sequence_array's default
+SHARD_ALIGNMENT = 64
+# Below this many terms the pool start-up costs more than it saves
+MIN_SHARD_TERMS = 1 << 16
+
+def _fill(out, kind, first_term, step, start, stop):
+    """Write terms start..stop-1 into out, an array of exactly that many terms."""
+    if kind == "arithmetic":
+        out[:] = arithmetic_terms(first_term, step, start, stop, dtype=out.dtype)
+    else:
+        out[:] = geometric_sequence_array(first_term, step, stop - start, out.dtype, offset=start)
+
+def _fill_shard(shm_name, dtype, num_terms, kind, first_term, step, start, stop):
+    """Worker: write terms start..stop-1 into the shared buffer named shm_name."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray((num_terms,), dtype=dtype, buffer=shm.buf)[start:stop]
+        _fill(out, kind, first_term, step, start, stop)
+        del out
+    finally:
+        shm.close()
+
+def _fill_file_shard(path, kind, first_term, step, start, stop):
+    """Worker: write terms start..stop-1 into the .npy file at path."""
+    sequence = open_sequence_file(path, writable=True)
+    _fill(sequence[start:stop], kind, first_term, step, start, stop)
+    sequence.flush()
+
+def _shard_bounds(num_terms, num_shards):
+    """Split range(num_terms) into at most num_shards aligned (start, stop) pairs."""
+    shard_size = -(-num_terms // num_shards)
+    shard_size = max(-(-shard_size // SHARD_ALIGNMENT) * SHARD_ALIGNMENT, MIN_SHARD_TERMS)
+    return [(start, min(start + shard_size, num_terms)) for start in range(0, num_terms, shard_size)]
+
+def _sharded_generate(kind, first_term, step, num_terms, workers, dtype, out_path=None):
+    workers = workers or os.cpu_count() or 1
+    dtype = np.dtype(dtype)
+    if out_path is not None:
+        # Create the file up front; the workers then fill their slices in place
+        np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype, shape=(num_terms,)).flush()
+    if num_terms == 0:
+        return open_sequence_file(out_path, writable=True) if out_path is not None else np.empty(0, dtype=dtype)
+    # A few shards per worker keeps the pool busy if some shards finish early
+    bounds = _shard_bounds(num_terms, workers * 4)
+    if out_path is not None:
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+            futures = [
+                pool.submit(_fill_file_shard, out_path, kind, first_term, step, start, stop)
+                for start, stop in bounds
+            ]
+            for future in futures:
+                future.result()
+        return open_sequence_file(out_path, writable=True)
+    shm = shared_memory.SharedMemory(create=True, size=num_terms * dtype.itemsize)
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+            futures = [
+                pool.submit(_fill_shard, shm.name, dtype.str, num_terms, kind, first_term, step, start, stop)
+                for start, stop in bounds
+            ]
+            for future in futures:
+                future.result()
+        # Copy out so the shared segment can be released before returning; this
+        # doubles the peak memory, which out_path avoids
+        return np.ndarray((num_terms,), dtype=dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+def sharded_arithmetic_sequence(first_term, common_difference, num_terms, workers=None, dtype=None, out_path=None):
+    """
+    Build an arithmetic sequence across a pool of worker processes.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_difference (float): The common difference between consecutive terms
+        num_terms (int): The number of terms to generate
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        dtype (numpy.dtype, optional): Element type of the result
+        out_path (str, optional): Have the workers write into a memory-mapped .npy
+            file at this path. Without it, the result is copied out of shared
+            memory, so the peak memory is twice its size.
+    
+    Returns:
+        numpy.ndarray: Same values as arithmetic_sequence_array with the same
+        arguments, or a numpy.memmap of the .npy file when out_path is given
+    """
+    if dtype is None:
+        dtype = np.result_type(first_term, common_difference)
+    return _sharded_generate("arithmetic", first_term, common_difference, num_terms, workers, dtype, out_path)
+
+def sharded_geometric_sequence(first_term, common_ratio, num_terms, workers=None, dtype=np.float64, out_path=None):
+    """
+    Build a geometric sequence across a pool of worker processes.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        num_terms (int): The number of terms to generate
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        dtype (numpy.dtype): Floating point element type of the result
+        out_path (str, optional): Have the workers write into a memory-mapped .npy
+            file at this path. Without it, the result is copied out of shared
+            memory, so the peak memory is twice its size.
+    
+    Returns:
+        numpy.ndarray: Same values as geometric_sequence_array with the same
+        arguments, or a numpy.memmap of the .npy file when out_path is given
+    """
+    return _sharded_generate("geometric", first_term, common_ratio, num_terms, workers, dtype, out_path)
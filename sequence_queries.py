@@ -0,0 +1,374 @@
+"""
+Closed-form queries on arithmetic and geometric sequences.
+
+Every function answers in O(1) arithmetic operations from the sequence parameters,
+without generating any terms. Indices are 0-based, so term 0 is the first term, and
+ranges are half-open like Python slices: range_sum(..., start, stop) adds the terms
+at indices start, start + 1, ..., stop - 1. When all inputs are integers the answers
+are exact Python ints, however large they get.
+
+Float geometric terms and sums that would overflow float64 are evaluated in the
+log domain instead and come back as a ScaledValue.
+"""
+import math
+import operator
+
+# log10 of the largest finite float64; anything above this overflows
+FLOAT_MAX_LOG10 = math.log10(float.fromhex("0x1.fffffffffffffp+1023"))
+
+class ScaledValue:
+    """
+    A real number too large for float64, stored as sign × mantissa × 10^exponent.
+    
+    sign is -1, 0 or 1, mantissa is in [1, 10) (0 for zero) and exponent is an int.
+    The mantissa carries about 16 - log10(|exponent|) significant digits, since it
+    comes from the fractional part of a base-10 logarithm.
+    
+    ScaledValues are immutable numbers, not tuples: they compare and hash by value
+    against each other and against ints and floats, and support negation, abs(),
+    multiplication and division by numbers. float() gives ±inf once the value is
+    beyond float64.
+    """
+    __slots__ = ("sign", "mantissa", "exponent")
+    
+    def __init__(self, sign, mantissa, exponent):
+        object.__setattr__(self, "sign", sign)
+        object.__setattr__(self, "mantissa", mantissa)
+        object.__setattr__(self, "exponent", exponent)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("ScaledValue is immutable")
+    
+    def __reduce__(self):
+        return ScaledValue, (self.sign, self.mantissa, self.exponent)
+    
+    @classmethod
+    def from_log10(cls, sign, log10_magnitude):
+        """Build a ScaledValue from a sign and log10 of the magnitude."""
+        if sign == 0 or log10_magnitude == -math.inf:
+            return cls(0, 0.0, 0)
+        exponent = math.floor(log10_magnitude)
+        mantissa = 10 ** (log10_magnitude - exponent)
+        # Rounding in the subtraction can land exactly on 10
+        if mantissa >= 10:
+            mantissa, exponent = mantissa / 10, exponent + 1
+        return cls(sign, mantissa, exponent)
+    
+    @classmethod
+    def from_number(cls, value):
+        """Convert a finite int or float (or a ScaledValue) to a ScaledValue."""
+        if isinstance(value, ScaledValue):
+            return value
+        return cls.from_log10(_sign(value), math.log10(abs(value)) if value else -math.inf)
+    
+    @property
+    def log10(self):
+        """log10 of the magnitude."""
+        return math.log10(self.mantissa) + self.exponent if self.sign else -math.inf
+    
+    def __float__(self):
+        if self.exponent > FLOAT_MAX_LOG10:
+            return math.copysign(math.inf, self.sign)
+        return self.sign * self.mantissa * 10.0 ** self.exponent
+    
+    def __bool__(self):
+        return self.sign != 0
+    
+    def __format__(self, spec):
+        # Honour the requested precision on the mantissa, always in scientific form
+        precision = spec.rsplit(".", 1)[1].rstrip("eEfFgG%") if "." in spec else ""
+        mantissa, exponent = self.mantissa, self.exponent
+        if precision:
+            text = f"{mantissa:.{precision}f}"
+            # Rounding can carry the mantissa up to 10, e.g. 9.999 at 2 places
+            if float(text) >= 10:
+                mantissa, exponent = mantissa / 10, exponent + 1
+                text = f"{mantissa:.{precision}f}"
+        else:
+            text = repr(mantissa)
+        return f"{'-' if self.sign < 0 else ''}{text}e{exponent:+d}"
+    
+    def __str__(self):
+        return format(self, "")
+    
+    def __repr__(self):
+        return f"ScaledValue(sign={self.sign!r}, mantissa={self.mantissa!r}, exponent={self.exponent!r})"
+    
+    def _order_key(self):
+        # Orders like the value itself: by sign, then magnitude, reversed below zero
+        if self.sign >= 0:
+            return (self.sign, self.exponent, self.mantissa)
+        return (self.sign, -self.exponent, -self.mantissa)
+    
+    def _compare(self, other, op):
+        if isinstance(other, float) and math.isinf(other):
+            return op(0, other)
+        if isinstance(other, float) and math.isnan(other):
+            return op(0.0, other)
+        if not isinstance(other, (int, float, ScaledValue)) or isinstance(other, bool):
+            return NotImplemented
+        return op(self._order_key(), ScaledValue.from_number(other)._order_key())
+    
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+    
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+    
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+    
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+    
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+    
+    def __hash__(self):
+        # Equal to a float exactly when the float is this value, so hash like one
+        value = float(self)
+        if math.isfinite(value) and ScaledValue.from_number(value) == self:
+            return hash(value)
+        return hash((self.sign, self.mantissa, self.exponent))
+    
+    def __neg__(self):
+        return ScaledValue(-self.sign, self.mantissa, self.exponent)
+    
+    def __pos__(self):
+        return self
+    
+    def __abs__(self):
+        return ScaledValue(abs(self.sign), self.mantissa, self.exponent)
+    
+    def __mul__(self, other):
+        if not isinstance(other, (int, float, ScaledValue)) or isinstance(other, bool):
+            return NotImplemented
+        other = ScaledValue.from_number(other)
+        return ScaledValue.from_log10(self.sign * other.sign, self.log10 + other.log10)
+    
+    __rmul__ = __mul__
+    
+    def __truediv__(self, other):
+        if not isinstance(other, (int, float, ScaledValue)) or isinstance(other, bool):
+            return NotImplemented
+        other = ScaledValue.from_number(other)
+        if not other.sign:
+            raise ZeroDivisionError("division by zero")
+        return ScaledValue.from_log10(self.sign * other.sign, self.log10 - other.log10)
+    
+    def __rtruediv__(self, other):
+        if not isinstance(other, (int, float)) or isinstance(other, bool):
+            return NotImplemented
+        return ScaledValue.from_number(other) / self
+
+def _is_integral(*values):
+    """Return True if every value is a plain (non-bool) integer."""
+    return all(isinstance(v, int) and not isinstance(v, bool) for v in values)
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+def _float_overflowed(result, *inputs):
+    """Return True if a float result is infinite only because of overflow."""
+    return math.isinf(result) and all(math.isfinite(v) for v in inputs)
+
+def _check_range(start, stop):
+    if start < 0 or stop < 0:
+        raise ValueError("Sequence indices must be non-negative.")
+    return max(stop - start, 0)
+
+def arithmetic_term(first_term, common_difference, index):
+    """
+    Return the term at a given index of an arithmetic sequence.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_difference (float): The common difference between consecutive terms
+        index (int): 0-based index of the term
+    
+    Returns:
+        float: The term a₁ + index·d
+    """
+    if index < 0:
+        raise ValueError("Sequence indices must be non-negative.")
+    return first_term + (index * common_difference)
+
+def arithmetic_range_sum(first_term, common_difference, start, stop):
+    """
+    Return the sum of the arithmetic sequence terms with start <= index < stop.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_difference (float): The common difference between consecutive terms
+        start (int): 0-based index of the first term included
+        stop (int): 0-based index one past the last term included
+    
+    Returns:
+        float: The range sum, an exact int when all inputs are integers
+    """
+    count = _check_range(start, stop)
+    if count == 0:
+        return 0
+    if _is_integral(first_term, common_difference):
+        # count * (2a + (start + stop - 1)d) is always even, so the division is exact
+        return count * (2 * first_term + (start + stop - 1) * common_difference) // 2
+    first = arithmetic_term(first_term, common_difference, start)
+    last = arithmetic_term(first_term, common_difference, stop - 1)
+    return (count / 2) * (first + last)
+
+def arithmetic_prefix_sum(first_term, common_difference, num_terms):
+    """
+    Return the sum of the first num_terms terms of an arithmetic sequence.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_difference (float): The common difference between consecutive terms
+        num_terms (int): The number of terms to add
+    
+    Returns:
+        float: The prefix sum, an exact int when all inputs are integers
+    """
+    return arithmetic_range_sum(first_term, common_difference, 0, num_terms)
+
+def geometric_term(first_term, common_ratio, index):
+    """
+    Return the term at a given index of a geometric sequence.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        index (int): 0-based index of the term
+    
+    Returns:
+        float: The term a₁·r^index, or a ScaledValue if it overflows float64
+    """
+    if index < 0:
+        raise ValueError("Sequence indices must be non-negative.")
+    try:
+        term = first_term * (common_ratio ** index)
+    except OverflowError:
+        return geometric_term_log(first_term, common_ratio, index)
+    if isinstance(term, float) and _float_overflowed(term, first_term, common_ratio):
+        return geometric_term_log(first_term, common_ratio, index)
+    return term
+
+def geometric_term_log(first_term, common_ratio, index):
+    """
+    Evaluate a geometric term in the log domain, without overflowing.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        index (int): 0-based index of the term
+    
+    Returns:
+        ScaledValue: The term a₁·r^index
+    """
+    if first_term == 0 or (common_ratio == 0 and index > 0):
+        return ScaledValue(0, 0.0, 0)
+    sign = _sign(first_term) * (_sign(common_ratio) if index % 2 else 1)
+    log10_magnitude = math.log10(abs(first_term)) + index * math.log10(abs(common_ratio)) if index else math.log10(abs(first_term))
+    return ScaledValue.from_log10(sign, log10_magnitude)
+
+def _geometric_series_factor(common_ratio, count):
+    """
+    Return (r^count - 1)/(r - 1) for a float ratio r ≠ 1.
+    
+    Near r = 1 the direct form subtracts two nearly equal numbers and loses most
+    of its digits, so there r^count - 1 is computed as expm1(count·log1p(r - 1)).
+    Within [0.5, 1.5] r - 1 is itself exact, so the result keeps close to full
+    precision.
+    """
+    step = common_ratio - 1
+    if abs(step) <= 0.5:
+        return math.expm1(count * math.log1p(step)) / step
+    return (common_ratio ** count - 1) / step
+
+def geometric_range_sum(first_term, common_ratio, start, stop):
+    """
+    Return the sum of the geometric sequence terms with start <= index < stop.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        start (int): 0-based index of the first term included
+        stop (int): 0-based index one past the last term included
+    
+    Returns:
+        float: The range sum, an exact int when all inputs are integers, or a
+        ScaledValue when a float sum would overflow float64
+    """
+    count = _check_range(start, stop)
+    if count == 0:
+        return 0
+    if common_ratio == 1:
+        return first_term * count
+    if _is_integral(first_term, common_ratio):
+        first = geometric_term(first_term, common_ratio, start)
+        # r - 1 always divides r^count - 1, so the division is exact
+        return first * (common_ratio ** count - 1) // (common_ratio - 1)
+    try:
+        first = first_term * (common_ratio ** start)
+        total = first * _geometric_series_factor(common_ratio, count)
+    except OverflowError:
+        return geometric_range_sum_log(first_term, common_ratio, start, stop)
+    if _float_overflowed(total, first_term, common_ratio):
+        return geometric_range_sum_log(first_term, common_ratio, start, stop)
+    return total
+
+def geometric_range_sum_log(first_term, common_ratio, start, stop):
+    """
+    Evaluate a geometric range sum in the log domain, without overflowing.
+    
+    Uses log|S| = log|a₁| + start·log|r| + log|r^count - 1| - log|r - 1|, where
+    r^count - 1 is replaced by r^count (or -1) once the other part is below
+    float64 resolution.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        start (int): 0-based index of the first term included
+        stop (int): 0-based index one past the last term included
+    
+    Returns:
+        ScaledValue: The sum of the terms with start <= index < stop
+    """
+    count = _check_range(start, stop)
+    if count == 0 or first_term == 0:
+        return ScaledValue(0, 0.0, 0)
+    if common_ratio == 1:
+        return ScaledValue.from_log10(_sign(first_term), math.log10(abs(first_term)) + math.log10(count))
+    first = geometric_term_log(first_term, common_ratio, start)
+    if first.sign == 0:
+        return first
+    # log10 |r^count|, then log10 |r^count - 1| with its sign
+    power_log10 = count * math.log10(abs(common_ratio)) if common_ratio else -math.inf
+    power_sign = _sign(common_ratio) if count % 2 else 1
+    if power_log10 > 17:
+        numerator_sign, numerator_log10 = power_sign, power_log10
+    elif power_log10 < -17:
+        numerator_sign, numerator_log10 = -1, 0.0
+    else:
+        if abs(common_ratio - 1) <= 0.5:
+            numerator = math.expm1(count * math.log1p(common_ratio - 1))
+        else:
+            numerator = common_ratio ** count - 1
+        if numerator == 0:
+            return ScaledValue(0, 0.0, 0)
+        numerator_sign, numerator_log10 = _sign(numerator), math.log10(abs(numerator))
+    sign = first.sign * numerator_sign * _sign(common_ratio - 1)
+    return ScaledValue.from_log10(sign, first.log10 + numerator_log10 - math.log10(abs(common_ratio - 1)))
+
+def geometric_prefix_sum(first_term, common_ratio, num_terms):
+    """
+    Return the sum of the first num_terms terms of a geometric sequence.
+    
+    Args:
+        first_term (float): The first term of the sequence
+        common_ratio (float): The common ratio between consecutive terms
+        num_terms (int): The number of terms to add
+    
+    Returns:
+        float: The prefix sum, an exact int when all inputs are integers
+    """
+    return geometric_range_sum(first_term, common_ratio, 0, num_terms)
@@ -0,0 +1,296 @@
+"""
+Asyncio HTTP service exposing the sequence engines.
+
+A small HTTP/1.1 server built on asyncio streams, with keep-alive connections.
+Endpoints (all GET, parameters in the query string):
+
+    /sequence?kind=arithmetic&first_term=1&step=2&num_terms=10
+        The terms, as JSON {"kind", "first_term", "step", "num_terms", "terms"},
+        or as raw little-endian float64 when the request has
+        "Accept: application/octet-stream" or "format=binary".
+    /sum?kind=geometric&first_term=1&step=2&num_terms=10
+        {"sum": ...}, computed in closed form. Sums beyond float64 come back as
+        strings such as "3.63e+176091"; so do terms beyond float64 in /sequence.
+    /health
+        {"status": "ok"}
+    /stats
+        Micro-batching statistics, {"batching": {...}} or {"batching": null}
+
+Requests for more than offload_threshold terms are computed in a process pool,
+so the event loop keeps serving other connections meanwhile. The pool's workers
+come from a fork server (or are spawned), never forked from the server itself:
+a forked worker would inherit the open client sockets and keep them from
+closing. Requests for at
+most batch_max_terms terms are merged by a MicroBatcher into vectorized batch
+calls, unless batch_window is 0.
+
+Run with `python sequence_server.py --port 8000`.
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from sequence_batching import MicroBatcher
+from sequence_core import arithmetic_sequence_array, geometric_sequence_array
+from sequence_queries import ScaledValue, arithmetic_prefix_sum, geometric_prefix_sum, geometric_term
+
+DEFAULT_OFFLOAD_THRESHOLD = 100000
+DEFAULT_MAX_TERMS = 10 ** 7
+DEFAULT_BATCH_WINDOW = 0.001
+DEFAULT_BATCH_MAX_TERMS = 1024
+# Seconds an idle keep-alive connection is kept open
+KEEP_ALIVE_TIMEOUT = 15
+MAX_HEADER_LINES = 100
+# Start method of the worker pool; see the module docstring
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+JSON_TYPE = "application/json"
+BINARY_TYPE = "application/octet-stream"
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+class RequestError(Exception):
+    """A client error, reported to the client with the given HTTP status."""
+    
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def parse_params(query, max_terms):
+    """
+    Validate the sequence parameters of a query string.
+    
+    Returns:
+        tuple: (kind, first_term, step, num_terms)
+    """
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    kind = params.get("kind", "arithmetic")
+    if kind not in ("arithmetic", "geometric"):
+        raise RequestError("kind must be arithmetic or geometric")
+    try:
+        first_term = float(params["first_term"])
+        step = float(params["step"])
+        num_terms = int(params["num_terms"])
+    except KeyError as e:
+        raise RequestError(f"missing parameter {e.args[0]}") from e
+    except ValueError as e:
+        raise RequestError(f"invalid parameter: {e}") from e
+    if not (math.isfinite(first_term) and math.isfinite(step)):
+        raise RequestError("first_term and step must be finite")
+    if not 0 <= num_terms <= max_terms:
+        raise RequestError(f"num_terms must be between 0 and {max_terms}")
+    return kind, first_term, step, num_terms
+
+def encode_terms(kind, first_term, step, num_terms, terms, binary):
+    """
+    Encode computed terms as a response body.
+    
+    Returns:
+        bytes: JSON document or raw little-endian float64 terms
+    """
+    if binary:
+        return terms.astype("<f8", copy=False).tobytes()
+    values = terms.tolist()
+    # JSON has no inf or nan; terms beyond float64 are sent as strings, like /sum does
+    for index in np.flatnonzero(~np.isfinite(terms)).tolist():
+        value = geometric_term(first_term, step, index) if kind == "geometric" else values[index]
+        values[index] = str(value)
+    document = {"kind": kind, "first_term": first_term, "step": step, "num_terms": num_terms, "terms": values}
+    return json.dumps(document, allow_nan=False).encode()
+
+def compute_sequence(kind, first_term, step, num_terms, binary):
+    """
+    Compute and encode the terms of a sequence.
+    
+    Module-level so it can run in a worker process.
+    
+    Returns:
+        bytes: JSON document or raw little-endian float64 terms
+    """
+    if kind == "arithmetic":
+        terms = arithmetic_sequence_array(first_term, step, num_terms, dtype=np.float64)
+    else:
+        terms = geometric_sequence_array(first_term, step, num_terms)
+    return encode_terms(kind, first_term, step, num_terms, terms, binary)
+
+def compute_sum(kind, first_term, step, num_terms):
+    """Return the JSON-encoded closed-form sum of a sequence."""
+    if kind == "arithmetic":
+        total = arithmetic_prefix_sum(first_term, step, num_terms)
+    else:
+        total = geometric_prefix_sum(first_term, step, num_terms)
+    return json.dumps({"sum": str(total) if isinstance(total, ScaledValue) else total}).encode()
+
+class SequenceServer:
+    """
+    HTTP server for the sequence engines.
+    
+    Args:
+        host (str): Interface to listen on
+        port (int): Port to listen on; 0 picks a free port
+        workers (int, optional): Size of the process pool for large requests
+        offload_threshold (int): Requests with more terms than this go to the pool
+        max_terms (int): Largest num_terms accepted
+        batch_window (float): Seconds the micro-batcher holds small requests; 0 disables it
+        batch_max_terms (int): Requests with at most this many terms are micro-batched
+    """
+    
+    def __init__(self, host="127.0.0.1", port=8000, workers=None, offload_threshold=DEFAULT_OFFLOAD_THRESHOLD,
+                 max_terms=DEFAULT_MAX_TERMS, batch_window=DEFAULT_BATCH_WINDOW, batch_max_terms=DEFAULT_BATCH_MAX_TERMS):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.offload_threshold = offload_threshold
+        self.max_terms = max_terms
+        self.batch_max_terms = batch_max_terms
+        self.batcher = MicroBatcher(batch_window) if batch_window > 0 else None
+        self._pool = None
+        self._server = None
+        # Handler task -> its stream writer, for every open connection
+        self._connections = {}
+    
+    async def start(self):
+        """Start listening; self.port holds the bound port afterwards."""
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context(POOL_START_METHOD)
+        )
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def stop(self):
+        """Stop listening and shut the worker pool down."""
+        if self._server is not None:
+            self._server.close()
+        # Idle keep-alive connections would otherwise linger until their timeout;
+        # closing the transport makes their pending read return EOF
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+    
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+    
+    async def _run(self, num_terms, func, *args):
+        if num_terms > self.offload_threshold:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+        return func(*args)
+    
+    async def _dispatch(self, method, target, headers):
+        if method != "GET":
+            raise RequestError("only GET is supported", 405)
+        url = urlsplit(target)
+        if url.path == "/health":
+            return JSON_TYPE, b'{"status": "ok"}'
+        if url.path == "/stats":
+            batching = self.batcher.stats() if self.batcher is not None else None
+            return JSON_TYPE, json.dumps({"batching": batching}).encode()
+        if url.path not in ("/sequence", "/sum"):
+            raise RequestError(f"no such endpoint {url.path}", 404)
+        kind, first_term, step, num_terms = parse_params(url.query, self.max_terms)
+        if url.path == "/sum":
+            return JSON_TYPE, compute_sum(kind, first_term, step, num_terms)
+        binary = BINARY_TYPE in headers.get("accept", "") or parse_qs(url.query).get("format", [""])[-1] == "binary"
+        if self.batcher is not None and num_terms <= self.batch_max_terms:
+            terms = await self.batcher.submit(kind, first_term, step, num_terms)
+            return (BINARY_TYPE if binary else JSON_TYPE), encode_terms(kind, first_term, step, num_terms, terms, binary)
+        body = await self._run(num_terms, compute_sequence, kind, first_term, step, num_terms, binary)
+        return (BINARY_TYPE if binary else JSON_TYPE), body
+    
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, JSON_TYPE, b'{"error": "malformed request line"}', keep_alive=False)
+                    break
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # Request bodies are not used, but must be drained to keep the connection in sync
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, 400, JSON_TYPE, b'{"error": "invalid Content-Length"}', keep_alive=False)
+                    break
+                if length:
+                    await reader.readexactly(length)
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+                try:
+                    content_type, body = await self._dispatch(method, target, headers)
+                    status = 200
+                except RequestError as e:
+                    status, content_type, body = e.status, JSON_TYPE, json.dumps({"error": str(e)}).encode()
+                except Exception as e:
+                    status, content_type, body = 500, JSON_TYPE, json.dumps({"error": str(e)}).encode()
+                await self._respond(writer, status, content_type, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+    
+    async def _respond(self, writer, status, content_type, body, keep_alive):
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1"))
+        writer.write(body)
+        await writer.drain()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the sequence engines over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, help="Worker processes for large requests; defaults to the CPU count")
+    parser.add_argument("--offload-threshold", type=int, default=DEFAULT_OFFLOAD_THRESHOLD,
+                        help="Requests with more terms than this run in the worker pool")
+    parser.add_argument("--max-terms", type=int, default=DEFAULT_MAX_TERMS)
+    parser.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW,
+                        help="Seconds to hold small requests for micro-batching; 0 disables it")
+    parser.add_argument("--batch-max-terms", type=int, default=DEFAULT_BATCH_MAX_TERMS)
+    args = parser.parse_args(argv)
+    server = SequenceServer(args.host, args.port, args.workers, args.offload_threshold, args.max_terms,
+                            args.batch_window, args.batch_max_terms)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
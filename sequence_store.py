@@ -0,0 +1,171 @@
+"""
+Persistent on-disk store for computed sequences and aggregates.
+
+The index and the aggregates live in one SQLite file, so the store survives
+server restarts. Sequence rows are looked up through the primary-key index on
+(kind, first_term, step, num_terms, dtype), and each row names a .npy file in a
+directory next to the database that holds the terms. A hit opens that file
+with open_sequence_file, so the terms are memory-mapped rather than copied out
+of the database, whatever their length. The store keeps every file it has
+opened mapped, so later hits cost one index lookup. When the payloads outgrow
+max_bytes, the oldest sequences are evicted first.
+"""
+import contextlib
+import os
+import sqlite3
+import threading
+import uuid
+
+import numpy as np
+
+from sequence_core import open_sequence_file
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sequence_files (
+    kind TEXT NOT NULL,
+    first_term REAL NOT NULL,
+    step REAL NOT NULL,
+    num_terms INTEGER NOT NULL,
+    dtype TEXT NOT NULL,
+    file TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    PRIMARY KEY (kind, first_term, step, num_terms, dtype)
+);
+CREATE TABLE IF NOT EXISTS aggregates (
+    kind TEXT NOT NULL,
+    first_term REAL NOT NULL,
+    step REAL NOT NULL,
+    num_terms INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (kind, first_term, step, num_terms, name)
+);
+"""
+
+class SequenceStore:
+    """
+    SQLite-backed store of sequences, keyed by (kind, a1, step, n, dtype).
+    
+    Args:
+        path (str): Path of the SQLite database file; created if missing
+        max_bytes (int): Budget for all stored sequence payloads
+        payload_dir (str, optional): Directory of the .npy payload files.
+            Defaults to path + ".payloads".
+    """
+    
+    def __init__(self, path, max_bytes=1024 ** 3, payload_dir=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.payload_dir = payload_dir if payload_dir is not None else path + ".payloads"
+        os.makedirs(self.payload_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        # Payload file name -> its open read-only memmap; file names are never reused
+        self._maps = {}
+        # One connection shared by all Streamlit session threads, serialized by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM sequence_files").fetchone()[0]
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._maps.clear()
+            self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def get_sequence(self, kind, first_term, step, num_terms, dtype=np.float64):
+        """
+        Look up a stored sequence.
+        
+        Returns:
+            numpy.memmap: Read-only memory-mapped array of the terms, or None if
+            it is not stored
+        """
+        key = (kind, float(first_term), float(step), int(num_terms), np.dtype(dtype).newbyteorder("<").str)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file FROM sequence_files WHERE kind = ? AND first_term = ? AND step = ? AND num_terms = ? AND dtype = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            sequence = self._maps.get(row[0])
+            if sequence is None:
+                try:
+                    sequence = self._maps[row[0]] = open_sequence_file(os.path.join(self.payload_dir, row[0]))
+                except FileNotFoundError:
+                    # The payload was removed behind the store's back; forget the row
+                    self._delete(key)
+                    return None
+            return sequence
+    
+    def put_sequence(self, kind, first_term, step, sequence):
+        """Store a sequence array, evicting the oldest sequences if over budget."""
+        sequence = np.ascontiguousarray(sequence, dtype=np.asarray(sequence).dtype.newbyteorder("<"))
+        if sequence.nbytes > self.max_bytes:
+            return
+        key = (kind, float(first_term), float(step), len(sequence), sequence.dtype.str)
+        name = uuid.uuid4().hex + ".npy"
+        # Written under a temporary name, so a reader never maps a partial file
+        partial = os.path.join(self.payload_dir, name + ".partial")
+        with open(partial, "wb") as f:
+            np.save(f, sequence, allow_pickle=False)
+        os.replace(partial, os.path.join(self.payload_dir, name))
+        with self._lock:
+            self._delete(key)
+            self._conn.execute("INSERT INTO sequence_files VALUES (?, ?, ?, ?, ?, ?, ?)", key + (name, sequence.nbytes))
+            self._bytes += sequence.nbytes
+            self._evict()
+    
+    def _delete(self, key):
+        """Remove the row for key and its payload file, if any; the caller holds the lock."""
+        row = self._conn.execute(
+            "SELECT file, nbytes FROM sequence_files WHERE kind = ? AND first_term = ? AND step = ? AND num_terms = ? AND dtype = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return
+        self._conn.execute(
+            "DELETE FROM sequence_files WHERE kind = ? AND first_term = ? AND step = ? AND num_terms = ? AND dtype = ?",
+            key,
+        )
+        self._remove_payload(*row)
+    
+    def _remove_payload(self, name, nbytes):
+        # Arrays already handed out keep their mapping of the unlinked file
+        self._maps.pop(name, None)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(os.path.join(self.payload_dir, name))
+        self._bytes -= nbytes
+    
+    def _evict(self):
+        # Rowids grow with insertion order, so the smallest rowid is the oldest row
+        while self._bytes > self.max_bytes:
+            rowid, name, nbytes = self._conn.execute(
+                "SELECT rowid, file, nbytes FROM sequence_files ORDER BY rowid LIMIT 1"
+            ).fetchone()
+            self._conn.execute("DELETE FROM sequence_files WHERE rowid = ?", (rowid,))
+            self._remove_payload(name, nbytes)
+    
+    def get_aggregate(self, kind, first_term, step, num_terms, name):
+        """Look up a stored aggregate such as "sum"; returns None if it is not stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM aggregates WHERE kind = ? AND first_term = ? AND step = ? AND num_terms = ? AND name = ?",
+                (kind, float(first_term), float(step), int(num_terms), name),
+            ).fetchone()
+        return None if row is None else row[0]
+    
+    def put_aggregate(self, kind, first_term, step, num_terms, name, value):
+        """Store a float aggregate such as "sum"."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aggregates VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, float(first_term), float(step), int(num_terms), name, float(value)),
+            )
@@ -0,0 +1,80 @@
+"""
+Smoke test for the sequence HTTP service against a server on localhost.
+
+Run with: python -m unittest test_sequence_server
+"""
+import json
+import socket
+import unittest
+
+from sequence_loadtest import start_server_process, stop_server_process
+
+HOST = "127.0.0.1"
+
+class SequenceServerSmokeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.process, cls.port = start_server_process(
+            HOST, ["--workers", "2", "--offload-threshold", "1000"]
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_server_process(cls.process)
+
+    def request(self, request_line, body=b"", headers=""):
+        """Send one request with Connection: close and return (status, headers, body) once the server closes."""
+        with socket.create_connection((HOST, self.port), timeout=10) as sock:
+            sock.sendall(
+                f"{request_line} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n{headers}\r\n".encode("latin-1")
+                + body
+            )
+            data = b""
+            while True:
+                block = sock.recv(65536)
+                if not block:
+                    break
+                data += block
+        head, _, body = data.partition(b"\r\n\r\n")
+        return int(head.split()[1]), head.decode("latin-1").lower(), body
+
+    def get_json(self, path):
+        status, _, body = self.request(f"GET {path}")
+        self.assertEqual(status, 200, body)
+        return json.loads(body)
+
+    def test_health(self):
+        self.assertEqual(self.get_json("/health"), {"status": "ok"})
+
+    def test_small_sequence(self):
+        result = self.get_json("/sequence?kind=arithmetic&first_term=1&step=2&num_terms=5")
+        self.assertEqual(result["terms"], [1, 3, 5, 7, 9])
+
+    def test_sum(self):
+        result = self.get_json("/sum?kind=geometric&first_term=1&step=2&num_terms=10")
+        self.assertEqual(float(result["sum"]), 1023)
+
+    def test_overflowing_geometric_terms_are_strings(self):
+        result = self.get_json("/sequence?kind=geometric&first_term=1&step=1e10&num_terms=40")
+        self.assertIsInstance(result["terms"][-1], str)
+
+    def test_offloaded_request_closes_connection(self):
+        # More terms than the offload threshold, so the request runs in the worker
+        # pool; the server must still close the connection once the response is sent
+        status, headers, body = self.request("GET /sequence?kind=arithmetic&first_term=0&step=1&num_terms=5000")
+        self.assertEqual(status, 200)
+        self.assertIn("connection: close", headers)
+        self.assertEqual(len(json.loads(body)["terms"]), 5000)
+
+    def test_binary_response(self):
+        status, _, body = self.request("GET /sequence?kind=arithmetic&first_term=1&step=1&num_terms=4&format=binary")
+        self.assertEqual(status, 200)
+        self.assertGreater(len(body), 0)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.request("GET /sequence?kind=arithmetic&first_term=nan&step=1&num_terms=4")[0], 400)
+        self.assertEqual(self.request("POST /sequence", headers="Content-Length: abc\r\n")[0], 400)
+        self.assertEqual(self.request("GET /nowhere")[0], 404)
+
+if __name__ == "__main__":
+    unittest.main()